@@ -15,6 +15,10 @@ from collections.abc import Iterable
 from .operators import register_operators, unregister_operators
 from .panels import register_panels, unregister_panels
 from .properties import register_properties, unregister_properties
+from .registry import register_registry, unregister_registry
+from .runner import register_runner, unregister_runner
+from .scope import register_scope, unregister_scope
+from .texture_cache import register_texture_cache, unregister_texture_cache
 from pathlib import Path
 
 def find_parent_folder_of_file(filename):
@@ -76,9 +80,17 @@ def register():
     register_properties()    # Register properties first
     register_operators()     # Register operators that may use these properties
     register_panels()        # Register panels that might display the properties
+    register_texture_cache() # Handlers keeping the material texture cache up to date
+    register_registry()      # Handlers keeping the live object registry up to date
+    register_scope()         # Handlers dropping the resolved operator scope when objects change
+    register_runner()        # Handlers cancelling chunked runs on undo
 
 def unregister():
-    unregister_panels()      # Unregister panels first
+    unregister_runner()        # Remove the handlers first
+    unregister_scope()
+    unregister_registry()
+    unregister_texture_cache()
+    unregister_panels()      # Then unregister panels
     unregister_operators()   # Then unregister operators
     unregister_properties()   # Finally, unregister properties
 
@@ -0,0 +1,251 @@
+"""
+Headless batch processing of .blend files.
+
+Runs a chain of Skeleton Tool operators on many .blend files, each file in its own background
+Blender instance, several instances at a time. Every file is saved after its chain ran and a
+report with the timing and errors of every step is written at the end.
+
+From a shell (plain Python, Blender is started for you):
+    python batch_cli.py --blender /path/to/blender --jobs 4 --report report.json models/*.blend
+
+Options:
+    --steps set.g2properties,parent.all,...   operators to run, in order
+    --setting folder_path=//skins/             set a Skeleton Tool setting before the chain runs,
+                                               the value is converted to the setting's type
+    --output-dir out/                          save copies there instead of overwriting the files
+    --no-save                                  don't save at all
+    --export-names names/                      write every file's object names there first, for planning.py
+
+create.skinfile writes next to each .blend (folder_path "//") when neither the file nor
+--setting gives a folder_path, so parallel jobs never write to the same file.
+
+Or on a single file, straight from Blender:
+    blender -b model.blend --python-expr "from skeleton_tool import batch_cli; batch_cli.run_chain()"
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ADDON = __package__ or os.path.basename(os.path.dirname(os.path.realpath(__file__)))
+
+# Settings a file gets when they are empty in it and not given, folder_path "//" is the folder of the .blend
+DEFAULT_SETTINGS = {
+    "folder_path": "//",
+}
+
+DEFAULT_STEPS = (
+    "set.g2properties",
+    "parent.all",
+    "create.tags",
+    "set.armaturemod",
+    "create.skinfile",
+)
+
+
+################################################################################################
+##                                                                                            ##
+##                                  INSIDE BLENDER                                            ##
+##                                                                                            ##
+################################################################################################
+
+def run_chain(steps=DEFAULT_STEPS, settings: dict | None = None, save: bool = True, output_dir: str | None = None, result_path: str | None = None, names_dir: str | None = None) -> dict:
+    """
+    Run operators (by bl_idname) one after the other on the open file and save it.
+    Returns, and writes to result_path when given, a dict with the time and status of every step.
+    With names_dir, the object names are written to <names_dir>/<file>.json before anything runs.
+    """
+    import addon_utils
+    import bpy
+
+    if not addon_utils.check(ADDON)[1]:
+        addon_utils.enable(ADDON, default_set=False)
+
+    result = {"file": bpy.data.filepath, "steps": [], "error": None}
+    started = time.perf_counter()
+
+    try:
+        scene_settings = bpy.context.scene.settings
+        for key, value in DEFAULT_SETTINGS.items():
+            if not getattr(scene_settings, key):
+                setattr(scene_settings, key, value)
+        for key, value in (settings or {}).items():
+            setattr(scene_settings, key, setting_value(scene_settings, key, value))
+
+        if names_dir:
+            export_names(names_dir)
+
+        for step in steps:
+            result["steps"].append(run_step(step))
+            if result["steps"][-1]["error"]:
+                result["error"] = f"{step}: {result['steps'][-1]['error']}"
+                break
+
+        if save and not result["error"]:
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+                filepath = os.path.join(output_dir, os.path.basename(bpy.data.filepath))
+                bpy.ops.wm.save_as_mainfile(filepath=filepath, copy=True)
+            else:
+                bpy.ops.wm.save_mainfile()
+    except Exception as e:
+        result["error"] = str(e)
+
+    result["seconds"] = time.perf_counter() - started
+
+    if result_path:
+        with open(result_path, "w") as f:
+            json.dump(result, f)
+
+    return result
+
+
+def setting_value(settings, key: str, value):
+    """ Convert a --setting value, given as text, to the type of the Skeleton Tool setting """
+    import bpy
+
+    if not isinstance(value, str):
+        return value
+
+    prop = settings.bl_rna.properties.get(key)
+    if prop is None:
+        raise KeyError(f"Unknown setting {key}")
+
+    if prop.type == 'BOOLEAN':
+        if value.lower() not in {"true", "false", "1", "0"}:
+            raise ValueError(f"{key} must be true or false, not {value}")
+        return value.lower() in {"true", "1"}
+    if prop.type == 'INT':
+        return int(value)
+    if prop.type == 'FLOAT':
+        return float(value)
+    if prop.type == 'POINTER':
+        # scope_collection, by name
+        collection = bpy.data.collections.get(value)
+        if collection is None:
+            raise KeyError(f"No collection named {value} for {key}")
+        return collection
+    return value
+
+
+def export_names(names_dir: str) -> str:
+    import bpy
+
+    os.makedirs(names_dir, exist_ok=True)
+    file_path = os.path.join(names_dir, os.path.splitext(os.path.basename(bpy.data.filepath))[0] + ".json")
+    with open(file_path, "w") as f:
+        json.dump([object.name for object in bpy.data.objects], f)
+    return file_path
+
+
+def run_step(step: str) -> dict:
+    import bpy
+
+    category, name = step.split(".", 1)
+    operator = getattr(getattr(bpy.ops, category), name)
+
+    started = time.perf_counter()
+    try:
+        status = operator()
+        error = None if 'FINISHED' in status else f"returned {', '.join(sorted(status))}"
+    except Exception as e:
+        status = set()
+        error = str(e)
+
+    print(f"[BATCH] {step} done in {time.perf_counter() - started:.3f}s")
+    return {"step": step, "seconds": time.perf_counter() - started, "status": sorted(status), "error": error}
+
+
+################################################################################################
+##                                                                                            ##
+##                                  OUTSIDE BLENDER                                           ##
+##                                                                                            ##
+################################################################################################
+
+def process_file(blender: str, blend_file: str, steps, settings: dict, save: bool, output_dir: str | None, names_dir: str | None = None) -> dict:
+    """ Run the chain on one file in its own background Blender instance """
+    handle, result_path = tempfile.mkstemp(suffix=".json")
+    os.close(handle)
+
+    arguments = {
+        "steps": list(steps),
+        "settings": settings,
+        "save": save,
+        "output_dir": os.path.abspath(output_dir) if output_dir else None,
+        "result_path": result_path,
+        "names_dir": os.path.abspath(names_dir) if names_dir else None,
+    }
+    expression = f"from {ADDON} import batch_cli; batch_cli.run_chain(**{arguments!r})"
+
+    started = time.perf_counter()
+    try:
+        process = subprocess.run(
+            [blender, "-b", blend_file, "--python-exit-code", "1", "--python-expr", expression],
+            capture_output=True, text=True,
+        )
+        try:
+            with open(result_path) as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            result = {"steps": [], "error": f"Blender exited with code {process.returncode}: {process.stderr.strip()[-500:]}"}
+    finally:
+        os.remove(result_path)
+
+    result["file"] = blend_file
+    result["total_seconds"] = time.perf_counter() - started
+    return result
+
+
+def parse_settings(pairs) -> dict:
+    """ NAME=VALUE pairs, the values stay text until run_chain() knows the type of every setting """
+    settings = {}
+    for pair in pairs or ():
+        key, _, value = pair.partition("=")
+        settings[key.strip()] = value
+    return settings
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run Skeleton Tool operators on many .blend files.")
+    parser.add_argument("files", nargs="+", help=".blend files to process")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Blender executable")
+    parser.add_argument("--steps", default=",".join(DEFAULT_STEPS), help="comma separated operator bl_idnames")
+    parser.add_argument("--setting", action="append", metavar="NAME=VALUE", help="Skeleton Tool setting to set first")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Blender instances running at once")
+    parser.add_argument("--output-dir", help="save copies here instead of overwriting the files")
+    parser.add_argument("--no-save", action="store_true", help="don't save the files")
+    parser.add_argument("--report", default="batch_report.json", help="where to write the report")
+    parser.add_argument("--export-names", metavar="DIR", help="write every file's object names to DIR (see planning.py)")
+    args = parser.parse_args(argv)
+
+    steps = [step.strip() for step in args.steps.split(",") if step.strip()]
+    settings = parse_settings(args.setting)
+
+    # Every job is a separate Blender process, the threads only wait for them
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        futures = [
+            pool.submit(process_file, args.blender, blend_file, steps, settings, not args.no_save, args.output_dir, args.export_names)
+            for blend_file in args.files
+        ]
+        results = []
+        for future in futures:
+            result = future.result()
+            results.append(result)
+            status = f"ERROR {result['error']}" if result["error"] else "OK"
+            print(f"{result['file']}: {status} ({result['total_seconds']:.2f}s)")
+
+    with open(args.report, "w") as f:
+        json.dump(results, f, indent=4)
+
+    failed = sum(1 for result in results if result["error"])
+    print(f"{len(results) - failed}/{len(results)} file(s) processed, report written to {args.report}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
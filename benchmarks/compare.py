@@ -0,0 +1,73 @@
+"""
+Compare two benchmark result files written by run_benchmarks.py.
+
+Plain Python, no Blender needed:
+    python compare.py new.json baseline.json --threshold 0.2
+
+Exits with 1 when an operator got slower than the threshold allows at any scene size.
+"""
+
+import argparse
+import json
+import sys
+
+# Differences below this are noise, whatever the ratio says
+MIN_DELTA_SECONDS = 0.005
+
+
+def load_results(file_path: str) -> dict:
+    with open(file_path) as f:
+        return json.load(f)
+
+
+def compare(new: dict, baseline: dict, threshold: float = 0.2) -> list[dict]:
+    """ One row per (scene size, operator) found in both files, flagged when it regressed """
+    rows = []
+
+    for size, operators in new["results"].items():
+        for operator, timing in operators.items():
+            old = baseline["results"].get(size, {}).get(operator)
+            if old is None:
+                continue
+
+            seconds = timing["seconds"]
+            old_seconds = old["seconds"]
+            ratio = seconds / old_seconds if old_seconds else float("inf")
+            regressed = ratio > 1 + threshold and seconds - old_seconds > MIN_DELTA_SECONDS
+
+            rows.append({
+                "size": size,
+                "operator": operator,
+                "seconds": seconds,
+                "baseline": old_seconds,
+                "ratio": ratio,
+                "regressed": regressed,
+            })
+
+    return rows
+
+
+def print_rows(rows: list[dict]) -> None:
+    print(f"{'size':<12}{'operator':<24}{'baseline':>12}{'now':>12}{'ratio':>9}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regressed"] else ""
+        print(f"{row['size']:<12}{row['operator']:<24}{row['baseline']:>11.4f}s{row['seconds']:>11.4f}s{row['ratio']:>8.2f}x{flag}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two Skeleton Tool benchmark runs.")
+    parser.add_argument("new", help="results of the run to check")
+    parser.add_argument("baseline", help="results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, 0.2 = 20%%")
+    args = parser.parse_args(argv)
+
+    rows = compare(load_results(args.new), load_results(args.baseline), args.threshold)
+    print_rows(rows)
+
+    regressions = sum(1 for row in rows if row["regressed"])
+    print(f"{regressions} regression(s) over {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Time the Skeleton Tool operators on synthetic Ghoul2 scenes of several sizes.
+
+Runs inside Blender, in the background:
+    blender -b --factory-startup --python benchmarks/run_benchmarks.py -- --sizes 1x9,4x40 --output new.json
+    blender -b --factory-startup --python benchmarks/run_benchmarks.py -- --output new.json --baseline old.json
+
+Sizes are LODSxPARTS (see synthetic_scene.py). Every operator runs --repeat times per size, each
+time on a freshly built scene, and the median is kept. With --baseline the results are compared
+(see compare.py) and Blender exits with 1 when something regressed over --threshold.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import addon_utils
+import bpy
+
+BENCHMARK_DIR = os.path.dirname(os.path.realpath(__file__))
+ADDON_DIR = os.path.dirname(BENCHMARK_DIR)
+ADDON = os.path.basename(ADDON_DIR)
+
+sys.path.insert(0, BENCHMARK_DIR)
+import compare
+import synthetic_scene
+
+DEFAULT_SIZES = "1x9,2x30,4x120"
+# build_scene() options per operator, create.tags needs a scene without tags to have work to do
+SCENE_OPTIONS = {
+    "create.tags": {"tags": False},
+}
+
+DEFAULT_OPERATORS = (
+    "set.g2properties",
+    "parent.all",
+    "create.tags",
+    "remove.emptyvgroups",
+    "set.armaturemod",
+    "clean.hierarchy",
+    "origin.geometry",
+    "remove.parent",
+    "create.skinfile",
+)
+
+
+def enable_addon() -> None:
+    if not addon_utils.check(ADDON)[1]:
+        sys.path.insert(0, os.path.dirname(ADDON_DIR))
+        importlib.import_module(ADDON).register()
+
+    # The g2 properties come from the JAG2GLM add-on, the benchmark only needs them to exist
+    if not hasattr(bpy.types.Object, "g2_prop_tag"):
+        print("[BENCH] JAG2GLM not found, registering plain g2 properties.")
+        bpy.types.Object.g2_prop_name = bpy.props.StringProperty()
+        bpy.types.Object.g2_prop_shader = bpy.props.StringProperty()
+        bpy.types.Object.g2_prop_off = bpy.props.BoolProperty()
+        bpy.types.Object.g2_prop_tag = bpy.props.BoolProperty()
+
+
+def run_operator(idname: str) -> float:
+    category, name = idname.split(".", 1)
+    operator = getattr(getattr(bpy.ops, category), name)
+
+    started = time.perf_counter()
+    operator()
+    return time.perf_counter() - started
+
+
+def benchmark(sizes, operators, repeat: int, resolution: int) -> dict:
+    results = {}
+    skin_dir = tempfile.mkdtemp(prefix="skeleton_tool_bench_")
+
+    for lods, parts in sizes:
+        size = f"{lods}x{parts}"
+        results[size] = {}
+
+        for idname in operators:
+            runs = []
+            for _ in range(repeat):
+                objects = synthetic_scene.build_scene(lods, parts, resolution, **SCENE_OPTIONS.get(idname, {}))
+                bpy.context.scene.settings.folder_path = skin_dir
+                runs.append(run_operator(idname))
+
+            results[size][idname] = {"seconds": statistics.median(runs), "runs": runs, "objects": objects}
+            print(f"[BENCH] {size:<10}{idname:<24}{statistics.median(runs):.4f}s ({objects} objects)")
+
+    return results
+
+
+def parse_sizes(text: str) -> list[tuple[int, int]]:
+    sizes = []
+    for size in text.split(","):
+        lods, _, parts = size.strip().partition("x")
+        sizes.append((int(lods), int(parts)))
+    return sizes
+
+
+def main() -> int:
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="run_benchmarks.py", description="Benchmark the Skeleton Tool operators.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma separated LODSxPARTS")
+    parser.add_argument("--operators", default=",".join(DEFAULT_OPERATORS), help="comma separated operator bl_idnames")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per operator and size, the median is kept")
+    parser.add_argument("--resolution", type=int, default=8, help="grid resolution of the LOD 0 meshes")
+    parser.add_argument("--output", default="benchmark_results.json", help="where to write the results")
+    parser.add_argument("--baseline", help="results of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown against the baseline, 0.2 = 20%%")
+    args = parser.parse_args(argv)
+
+    enable_addon()
+
+    operators = [idname.strip() for idname in args.operators.split(",") if idname.strip()]
+    results = {
+        "blender": bpy.app.version_string,
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "repeat": args.repeat,
+        "resolution": args.resolution,
+        "results": benchmark(parse_sizes(args.sizes), operators, max(1, args.repeat), args.resolution),
+    }
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=4)
+    print(f"[BENCH] Results written to {args.output}")
+
+    if not args.baseline:
+        return 0
+
+    rows = compare.compare(results, compare.load_results(args.baseline), args.threshold)
+    compare.print_rows(rows)
+    return 1 if any(row["regressed"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
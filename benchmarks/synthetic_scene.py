@@ -0,0 +1,135 @@
+"""
+Synthetic Ghoul2 scenes for the benchmarks.
+
+build_scene(lods, parts) empties the file and builds scene_root, skeleton_root and model_root_N,
+then for every LOD: the nine core body parts plus extra pieces up to `parts`, a cap for every
+core part, every tag of the add-on's tags.json (tag_templates.load_tag_templates()), one
+stupidtriangle and one .001 duplicate. Meshes are quad grids with an n-gon on top, weighted to a
+few bones plus some vertex groups that remove.emptyvgroups should remove. Tags keep the
+weights of their template and get no g2 properties. Nothing is parented, that is left to the
+operators.
+"""
+
+import importlib
+import os
+
+import bpy
+import bmesh
+from mathutils import Matrix
+
+# The add-on package this benchmark folder belongs to, it has to be importable (see run_benchmarks.py)
+ADDON = os.path.basename(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+CORE_PARTS = ("hips", "torso", "head", "l_arm", "r_arm", "l_hand", "r_hand", "l_leg", "r_leg")
+
+CAP_TARGETS = {
+    "hips": "torso",
+    "torso": "head",
+    "head": "torso",
+    "l_arm": "torso",
+    "r_arm": "torso",
+    "l_hand": "l_arm",
+    "r_hand": "r_arm",
+    "l_leg": "hips",
+    "r_leg": "hips",
+}
+
+BONES = ("lower_lumbar", "upper_lumbar", "thoracic", "cervical", "cranium", "lhumerus", "rhumerus", "ltibia", "rtibia")
+
+
+def build_scene(lods: int, parts: int, resolution: int = 8, ngons: bool = True, tags: bool = True) -> int:
+    """ Build a fresh synthetic scene, returns the number of objects in it. tags=False leaves the tags to create.tags. """
+    clear_scene()
+    collection = bpy.context.scene.collection
+
+    def link(object):
+        collection.objects.link(object)
+        return object
+
+    link(bpy.data.objects.new("scene_root", None))
+    link(bpy.data.objects.new("skeleton_root", bpy.data.armatures.new("skeleton_root")))
+
+    materials = {base: make_material(base) for base in CORE_PARTS}
+    templates = importlib.import_module(f"{ADDON}.tag_templates").load_tag_templates() if tags else []
+
+    for lod in range(lods):
+        link(bpy.data.objects.new(f"model_root_{lod}", None))
+        resolution_lod = max(2, resolution >> lod)
+
+        names = [(base, f"{base}_{lod}") for base in CORE_PARTS]
+        names += [(CORE_PARTS[i % len(CORE_PARTS)], f"{CORE_PARTS[i % len(CORE_PARTS)]}_piece{i}_{lod}") for i in range(max(0, parts - len(CORE_PARTS)))]
+        names += [(base, f"{base}_cap_{CAP_TARGETS[base]}_off_{lod}") for base in CORE_PARTS]
+
+        for i, (base, name) in enumerate(names):
+            object = link(bpy.data.objects.new(name, make_mesh(name, resolution_lod, ngons)))
+            object.location = (i % 10, i // 10, lod * 2)
+            object.data.materials.append(materials[base])
+            add_vertex_groups(object)
+
+        for template in templates:
+            name = f"{template.name}_{lod}"
+            object = link(bpy.data.objects.new(name, make_tag(name, template)))
+            object.location = (0, 0, lod * 2)
+            add_tag_groups(object, template)
+
+        link(bpy.data.objects.new(f"stupidtriangle_off_{lod}", make_mesh(f"stupidtriangle_off_{lod}", 1, False)))
+        # Same name twice, Blender makes it torso_N.001
+        link(bpy.data.objects.new(f"torso_{lod}", make_mesh(f"torso_dup_{lod}", 2, False)))
+
+    return len(bpy.data.objects)
+
+
+def clear_scene() -> None:
+    """ Remove everything a previous build or operator run left behind, the add-on stays registered """
+    for datablocks in (bpy.data.objects, bpy.data.meshes, bpy.data.armatures, bpy.data.materials, bpy.data.images):
+        bpy.data.batch_remove(list(datablocks))
+
+    bpy.context.scene.pop("skeleton_tool_fingerprints", None)
+
+
+def make_mesh(name: str, resolution: int, ngons: bool) -> bpy.types.Mesh:
+    bm = bmesh.new()
+    bmesh.ops.create_grid(bm, x_segments=resolution, y_segments=resolution, size=1.0)
+    if ngons:
+        bmesh.ops.create_circle(bm, cap_ends=True, segments=12, radius=0.5, matrix=Matrix.Translation((0.0, 0.0, 1.0)))
+
+    mesh = bpy.data.meshes.new(name)
+    bm.to_mesh(mesh)
+    bm.free()
+    return mesh
+
+
+def make_tag(name: str, template) -> bpy.types.Mesh:
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(template.vertices, [], template.faces)
+    mesh.update()
+    return mesh
+
+
+def add_tag_groups(object: bpy.types.Object, template) -> None:
+    for group_name, weights in template.vertex_groups.items():
+        vg = object.vertex_groups.new(name=group_name)
+        for weight, indices in weights:
+            vg.add(list(indices), weight, 'REPLACE')
+
+
+def add_vertex_groups(object: bpy.types.Object) -> None:
+    count = len(object.data.vertices)
+    band = max(1, count // 3)
+
+    for i, bone in enumerate(BONES[:3]):
+        vg = object.vertex_groups.new(name=bone)
+        vg.add(list(range(i * band, min(count, (i + 2) * band))), 0.5, 'REPLACE')
+
+    # These are what remove.emptyvgroups is for
+    object.vertex_groups.new(name="empty")
+    object.vertex_groups.new(name="almost_empty").add([0, 1], 1.0, 'REPLACE')
+
+
+def make_material(base: str) -> bpy.types.Material:
+    material = bpy.data.materials.new(base)
+    material.use_nodes = True
+    node = material.node_tree.nodes.new("ShaderNodeTexImage")
+    node.image = bpy.data.images.new(base, 4, 4)
+    node.image.filepath = f"C:/jka/base/models/players/synthetic/{base}.tga"
+    return material
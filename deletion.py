@@ -0,0 +1,92 @@
+import bpy
+
+from .profiling import phase
+
+
+class DeletionQueue:
+    """
+    Collects objects that have to go (stupidtriangles, .00x duplicates) while the scene is being
+    scanned, and removes all of them in a single bpy.data.batch_remove() call afterwards.
+
+    Nothing is deleted while iterating, so no ReferenceError halfway through a loop, and
+    nothing is selected, so no selection leaks into the next deletion.
+
+    ---------
+    Methods:
+    ---------
+    add(self, object)
+        Queue an object for deletion, queueing the same object twice is fine.
+
+    flush(self, purge=False)
+        Remove every queued object. With purge=True the meshes and materials that were only
+        used by those objects are removed as well. Returns the number of objects removed.
+    """
+
+    def __init__(self, objects=()):
+        self.objects: dict[int, bpy.types.Object] = {}
+        self.extend(objects)
+
+    def __len__(self) -> int:
+        return len(self.objects)
+
+    def add(self, object: bpy.types.Object) -> None:
+        try:
+            self.objects[object.as_pointer()] = object
+        except ReferenceError:
+            pass
+
+    def extend(self, objects) -> None:
+        for object in objects:
+            self.add(object)
+
+    def flush(self, purge: bool = False) -> int:
+        objects = []
+        data = []
+
+        for object in self.objects.values():
+            try:
+                if object.name not in bpy.data.objects:
+                    continue
+                objects.append(object)
+                if object.data is not None:
+                    data.append(object.data)
+            except ReferenceError:
+                continue
+
+        self.objects.clear()
+
+        with phase("delete", len(objects)):
+            if objects:
+                bpy.data.batch_remove(objects)
+
+            if purge and data:
+                purge_orphans(data)
+
+        return len(objects)
+
+
+def purge_orphans(data) -> int:
+    """ Remove the given object data and their materials if nothing uses them anymore """
+    orphans = {}
+    materials = {}
+
+    for datablock in data:
+        try:
+            if datablock.users:
+                continue
+            orphans[datablock.as_pointer()] = datablock
+            for material in getattr(datablock, "materials", ()):
+                if material is not None:
+                    materials[material.as_pointer()] = material
+        except ReferenceError:
+            continue
+
+    if orphans:
+        bpy.data.batch_remove(list(orphans.values()))
+
+    # Materials only lose their users once the meshes are gone
+    orphan_materials = [material for material in materials.values() if not material.users]
+    if orphan_materials:
+        bpy.data.batch_remove(orphan_materials)
+
+    return len(orphans) + len(orphan_materials)
@@ -0,0 +1,58 @@
+import bpy
+import json
+
+# Scene custom property holding the fingerprints of the last successful runs
+FINGERPRINT_PROPERTY = "skeleton_tool_fingerprints"
+
+
+def object_fingerprint(object: bpy.types.Object) -> str:
+    """ What an object looked like: its parent and, for meshes, its polygon count """
+    parent = object.parent.name if object.parent else ""
+    polygons = len(object.data.polygons) if object.type == 'MESH' and object.data else -1
+    return f"{parent}|{polygons}"
+
+
+def scene_fingerprints(objects) -> dict[str, str]:
+    fingerprints = {}
+    for object in objects:
+        try:
+            fingerprints[object.name] = object_fingerprint(object)
+        except ReferenceError:
+            continue
+    return fingerprints
+
+
+def load_fingerprints(scene: bpy.types.Scene, key: str) -> dict[str, str] | None:
+    """ Fingerprints stored by the last successful run of key, None if there never was one """
+    try:
+        return json.loads(scene.get(FINGERPRINT_PROPERTY, "{}")).get(key)
+    except (TypeError, ValueError):
+        return None
+
+
+def store_fingerprints(scene: bpy.types.Scene, key: str, objects) -> None:
+    """
+    Remember what these objects look like now, the next incremental run of key starts from here.
+    Fingerprints of objects that aren't passed in are kept, so a run on a single LOD leaves the others alone.
+    Fingerprints of every key whose object no longer exists are dropped.
+    """
+    try:
+        stored = json.loads(scene.get(FINGERPRINT_PROPERTY, "{}"))
+    except (TypeError, ValueError):
+        stored = {}
+
+    stored[key] = {**stored.get(key, {}), **scene_fingerprints(objects)}
+
+    existing = {object.name for object in bpy.data.objects}
+    for stored_key, fingerprints in stored.items():
+        stored[stored_key] = {name: fingerprint for name, fingerprint in fingerprints.items() if name in existing}
+    scene[FINGERPRINT_PROPERTY] = json.dumps(stored, separators=(",", ":"))
+
+
+def changed_objects(objects, previous: dict[str, str]) -> set[str]:
+    """ Names of the objects that were added, renamed or changed since the fingerprints were taken """
+    changed = set()
+    for name, fingerprint in scene_fingerprints(objects).items():
+        if previous.get(name) != fingerprint:
+            changed.add(name)
+    return changed
@@ -0,0 +1,105 @@
+"""
+Diff-based Ghoul2 property assignment.
+
+plan_changes() works out the target g2 properties of every object in one scan (the rules are
+naming.g2_properties) and compares them with what the objects have, apply_changes() then only
+writes the properties that differ. Every property write is an RNA update and a bit of undo
+memory, so on a scene that is already right nothing gets written at all.
+
+A dry run only plans, the changes of the last run (dry or not) are kept in last_changes.
+"""
+
+import bpy
+from typing import Any, NamedTuple
+
+from .naming import g2_properties
+from .profiling import phase
+from .runner import chunks, complete
+
+
+class PropertyChange(NamedTuple):
+    object: str
+    property: str
+    old: Any
+    new: Any
+
+
+# Changes of the last sync_g2_properties() run
+last_changes: list[PropertyChange] = []
+
+
+def target_properties(name: str) -> dict[str, Any]:
+    """ The g2 properties an object with this name should have, g2_prop_off is left out when the name doesn't decide it """
+    properties = g2_properties(name)
+    targets = {
+        "g2_prop_name": properties.name,
+        "g2_prop_shader": properties.shader,
+        "g2_prop_tag": properties.tag,
+    }
+    if properties.off is not None:
+        targets["g2_prop_off"] = properties.off
+    return targets
+
+
+def plan_changes(objects) -> list[PropertyChange]:
+    """ Every g2 property of these objects that differs from its target, nothing is written """
+    changes = []
+
+    for object in objects:
+        try:
+            name = object.name
+            for property, value in target_properties(name).items():
+                current = getattr(object, property)
+                if current != value:
+                    changes.append(PropertyChange(name, property, current, value))
+        except ReferenceError:
+            continue
+
+    return changes
+
+
+def apply_changes(changes: list[PropertyChange], objects: dict[str, bpy.types.Object]) -> int:
+    """ Write planned changes, objects maps names to objects. Returns the number of writes. """
+    writes = 0
+
+    for change in changes:
+        object = objects.get(change.object)
+        if object is None:
+            continue
+        try:
+            setattr(object, change.property, change.new)
+            writes += 1
+        except ReferenceError:
+            continue
+
+    return writes
+
+
+def sync_g2_properties(objects, dry_run: bool = False) -> tuple[list[PropertyChange], int]:
+    """ Plan and (unless dry_run) apply the g2 properties of objects, returns (changes, writes) """
+    return complete(sync_steps(objects, dry_run))
+
+
+def sync_steps(objects, dry_run: bool = False):
+    """ sync_g2_properties() as a generator: yields (objects done, objects) every chunk of objects, see runner.py """
+    by_name = {}
+    for object in objects:
+        try:
+            by_name[object.name] = object
+        except ReferenceError:
+            continue
+
+    changes = []
+    writes = 0
+
+    with phase("g2 properties", len(by_name)):
+        for done, names in chunks(list(by_name)):
+            yield done, len(by_name)
+            chunk = {name: by_name[name] for name in names}
+            chunk_changes = plan_changes(chunk.values())
+            if not dry_run:
+                writes += apply_changes(chunk_changes, chunk)
+            changes += chunk_changes
+
+    last_changes[:] = changes
+    return changes, writes
@@ -0,0 +1,193 @@
+"""
+LOD generation from the model_root_0 hierarchy.
+
+generate_lods() copies model_root_0 and everything below it to model_root_N, renaming every
+"_0" suffix to "_N". Objects are copied with object.copy(), so vertex groups, modifiers (the
+armature modifier keeps pointing at skeleton_root), g2 properties and the parent inverse
+matrices come along for free. Body parts get a decimated copy of their mesh, tags and caps
+share the LOD 0 mesh, they are small and have to stay exactly where they are.
+
+Decimation is vertex clustering done in NumPy: every vertex is snapped to a grid cell, each cell
+collapses onto one vertex moved to the cell's centre, and triangles that lose a corner disappear.
+The cell size is searched for until the mesh fits its triangle budget (the LOD 0 triangle count
+times ratio ** N), which only needs the coordinate and triangle arrays. The result is then
+welded in a single bmesh call per mesh, which keeps UVs, materials and the deform weights.
+"""
+
+import bpy
+import bmesh
+import math
+import numpy as np
+
+from .meshops import needs_triangulation, polygon_sizes, triangle_indices, triangulate_mesh, vertex_coordinates
+from .naming import lod_name, parse_name, split_lod, ROLE_CAP, ROLE_TAG
+from .parenting import apply_parenting
+from .profiling import phase
+
+# Never decimate below this many triangles
+MIN_TRIANGLES = 4
+
+# Cell size search steps, each one halves the (logarithmic) interval
+SEARCH_STEPS = 16
+
+
+def triangle_count(mesh: bpy.types.Mesh) -> int:
+    """ Triangles the mesh has once triangulated """
+    if not mesh.polygons:
+        return 0
+    return int((polygon_sizes(mesh) - 2).sum())
+
+
+def cluster_vertices(coordinates: np.ndarray, cell: float) -> np.ndarray:
+    """ Cluster index of every vertex, vertices in the same grid cell share one """
+    keys = np.floor((coordinates - coordinates.min(axis=0)) / cell).astype(np.int64)
+    _, clusters = np.unique(keys, axis=0, return_inverse=True)
+    return clusters.reshape(-1)
+
+
+def clustered_triangle_count(triangles: np.ndarray, clusters: np.ndarray) -> int:
+    """ Triangles left once every cluster is collapsed: no degenerate ones, no duplicates """
+    corners = clusters[triangles]
+    kept = (corners[:, 0] != corners[:, 1]) & (corners[:, 1] != corners[:, 2]) & (corners[:, 0] != corners[:, 2])
+    if not kept.any():
+        return 0
+    return len(np.unique(np.sort(corners[kept], axis=1), axis=0))
+
+
+def clusters_for_budget(coordinates: np.ndarray, triangles: np.ndarray, budget: int) -> np.ndarray | None:
+    """
+    The finest clustering that leaves at most budget triangles, None when the mesh already fits.
+    The cell size is bisected between a ten thousandth of the mesh size and the whole mesh.
+    """
+    if len(triangles) <= budget:
+        return None
+
+    size = float(np.ptp(coordinates, axis=0).max())
+    if size <= 0:
+        return None
+
+    low, high = size * 1e-4, size
+    best = None
+
+    for _ in range(SEARCH_STEPS):
+        cell = math.sqrt(low * high)
+        clusters = cluster_vertices(coordinates, cell)
+        if clustered_triangle_count(triangles, clusters) > budget:
+            low = cell
+        else:
+            high = cell
+            best = clusters
+
+    return best if best is not None else cluster_vertices(coordinates, high)
+
+
+def decimate_mesh(mesh: bpy.types.Mesh, budget: int, name: str) -> bpy.types.Mesh:
+    """ A triangulated copy of mesh with at most budget triangles (as far as clustering gets there) """
+    copy = mesh.copy()
+    copy.name = name
+
+    if needs_triangulation(copy):
+        triangulate_mesh(copy)
+
+    coordinates = vertex_coordinates(copy)
+    clusters = clusters_for_budget(coordinates, triangle_indices(copy), budget)
+    if clusters is None:
+        return copy
+
+    # Move every vertex to the centre of its cluster, the welded vertex ends up there
+    count = int(clusters.max()) + 1
+    sizes = np.bincount(clusters, minlength=count)[:, None]
+    centres = np.stack([np.bincount(clusters, weights=coordinates[:, axis], minlength=count) for axis in range(3)], axis=1) / sizes
+    copy.vertices.foreach_set("co", centres[clusters].astype(np.float32).ravel())
+
+    # The first vertex of each cluster is the one that stays, it keeps its UVs and weights
+    _, first = np.unique(clusters, return_index=True)
+    targets = first[clusters].tolist()
+
+    bm = bmesh.new()
+    try:
+        bm.from_mesh(copy)
+        bm.verts.ensure_lookup_table()
+        verts = bm.verts
+        targetmap = {verts[index]: verts[target] for index, target in enumerate(targets) if index != target}
+        bmesh.ops.weld_verts(bm, targetmap=targetmap)
+        bm.to_mesh(copy)
+    finally:
+        bm.free()
+
+    copy.update()
+    return copy
+
+
+def lod_object_name(name: str, lod: int) -> str:
+    """ "l_arm_0" -> "l_arm_2", names without a LOD suffix get one """
+    return lod_name(split_lod(name)[0], lod)
+
+
+def shares_mesh(object: bpy.types.Object) -> bool:
+    """ Tags and caps keep the LOD 0 mesh instead of a decimated one """
+    if getattr(object, "g2_prop_tag", False):
+        return True
+    return parse_name(object.name).role in (ROLE_TAG, ROLE_CAP)
+
+
+def generate_lods(source_root: bpy.types.Object, lods, ratio: float, min_triangles: int = MIN_TRIANGLES) -> tuple[int, int]:
+    """
+    Copy source_root (model_root_0) and its hierarchy once for every LOD in lods.
+    Objects whose LOD name is already taken are left alone, their copies' children are parented
+    to the existing object instead. Returns (objects created, objects skipped).
+    """
+    hierarchy = [source_root] + list(source_root.children_recursive)
+    created = 0
+    skipped = 0
+
+    for lod in lods:
+        factor = ratio ** lod
+        copies = {}  # LOD 0 object -> its object in this LOD, created or already there
+        created_here = []
+        meshes = {}  # LOD 0 mesh pointer -> mesh of this LOD, meshes shared by several objects are done once
+
+        with phase(f"LOD {lod}") as building:
+            for object in hierarchy:
+                name = lod_object_name(object.name, lod)
+                existing = bpy.data.objects.get(name)
+                if existing:
+                    copies[object] = existing
+                    skipped += 1
+                    continue
+
+                copy = object.copy()
+                copy.name = name
+
+                if object.type == 'MESH' and object.data and not shares_mesh(object):
+                    key = object.data.as_pointer()
+                    if key not in meshes:
+                        budget = max(min_triangles, round(triangle_count(object.data) * factor))
+                        meshes[key] = decimate_mesh(object.data, budget, name)
+                    copy.data = meshes[key]
+
+                for collection in object.users_collection:
+                    collection.objects.link(copy)
+
+                copies[object] = copy
+                created_here.append(object)
+            building.objects = len(created_here)
+
+        # Copies have the same world matrices as their originals, so the copied parent inverse stays
+        # valid under a copied parent. An existing parent can be anywhere, those go through
+        # apply_parenting, which works the inverse out from the world matrices.
+        created_set = set(created_here)
+        existing_parents = []
+        for object in created_here:
+            if object.parent not in copies:
+                continue
+            if object.parent in created_set:
+                copies[object].parent = copies[object.parent]
+            else:
+                existing_parents.append((copies[object], copies[object.parent]))
+
+        if existing_parents:
+            apply_parenting(existing_parents)
+        created += len(created_here)
+
+    return created, skipped
@@ -0,0 +1,166 @@
+import bpy
+import bmesh
+import numpy as np
+from mathutils import Matrix, Vector
+
+from .runner import complete
+
+# Origins closer than this to the geometry center are left where they are
+ORIGIN_EPSILON = 1e-6
+
+
+def polygon_sizes(mesh: bpy.types.Mesh) -> np.ndarray:
+    """ Number of vertices of every polygon, read in one foreach_get call """
+    sizes = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", sizes)
+    return sizes
+
+
+def needs_triangulation(mesh: bpy.types.Mesh) -> bool:
+    if not mesh.polygons:
+        return False
+    return bool((polygon_sizes(mesh) > 3).any())
+
+
+def triangulate_meshes(objects) -> int:
+    """
+    Triangulate the mesh data of many objects in one pass, straight through bmesh.
+
+    Quads and n-gons are split with the BEAUTY method (same result as the Triangulate modifier
+    with min_vertices = 4), without operators, so selection and the active object stay untouched.
+    Meshes that are already all triangles are skipped, meshes shared by several objects are
+    only done once. Returns the number of meshes that were triangulated.
+    """
+    return complete(triangulate_steps(objects))
+
+
+def triangulate_steps(objects):
+    """ triangulate_meshes() as a generator: yields (objects done, objects) after every object, see runner.py """
+    objects = list(objects)
+    seen = set()
+    triangulated = 0
+
+    for done, object in enumerate(objects):
+        yield done, len(objects)
+        try:
+            if object.type != 'MESH':
+                continue
+            mesh = object.data
+        except ReferenceError:
+            continue
+
+        if mesh is None or mesh.library or mesh.as_pointer() in seen:
+            continue
+        seen.add(mesh.as_pointer())
+
+        if not needs_triangulation(mesh):
+            continue
+
+        triangulate_mesh(mesh)
+        triangulated += 1
+
+    return triangulated
+
+
+def triangulate_mesh(mesh: bpy.types.Mesh) -> None:
+    """ Split the quads and n-gons of a single mesh with the BEAUTY method """
+    bm = bmesh.new()
+    try:
+        bm.from_mesh(mesh)
+        faces = [face for face in bm.faces if len(face.verts) > 3]
+        bmesh.ops.triangulate(bm, faces=faces, quad_method='BEAUTY', ngon_method='BEAUTY')
+        bm.to_mesh(mesh)
+    finally:
+        bm.free()
+
+    mesh.update()
+
+
+def vertex_coordinates(mesh: bpy.types.Mesh) -> np.ndarray:
+    """ (vertices, 3) array of the local vertex coordinates, read in one foreach_get call """
+    coordinates = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coordinates)
+    return coordinates.reshape(-1, 3)
+
+
+def triangle_indices(mesh: bpy.types.Mesh) -> np.ndarray:
+    """ (triangles, 3) array of vertex indices, the mesh must be all triangles """
+    indices = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", indices)
+    return indices.reshape(-1, 3)
+
+
+def geometry_center(mesh: bpy.types.Mesh, center: str = 'BOUNDS') -> Vector | None:
+    """ Center of the bounding box ('BOUNDS') or the average vertex ('MEDIAN') in mesh space, None for empty meshes """
+    if not mesh.vertices:
+        return None
+
+    coordinates = vertex_coordinates(mesh).astype(np.float64)
+    if center == 'MEDIAN':
+        return Vector(coordinates.mean(axis=0))
+    return Vector((coordinates.min(axis=0) + coordinates.max(axis=0)) / 2)
+
+
+def shift_mesh(mesh: bpy.types.Mesh, offset: Vector) -> None:
+    """ Move every vertex (and every shape key) of a mesh by offset, in mesh space """
+    delta = np.array(offset, dtype=np.float32)
+
+    coordinates = vertex_coordinates(mesh)
+    mesh.vertices.foreach_set("co", (coordinates + delta).ravel())
+
+    if mesh.shape_keys:
+        buffer = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        for key_block in mesh.shape_keys.key_blocks:
+            key_block.data.foreach_get("co", buffer)
+            key_block.data.foreach_set("co", (buffer.reshape(-1, 3) + delta).ravel())
+
+    mesh.update()
+
+
+def origin_steps(objects, center: str = 'BOUNDS'):
+    """
+    Move the origin of every mesh object to the center of its geometry, like Origin to Geometry,
+    without operators and without touching the selection.
+
+    The mesh is shifted by -center and the object by +center (in its own space), so it stays
+    where it is in the world. Children get the inverse shift in their parent inverse matrix and
+    don't move either. Meshes shared by several objects are only done when all of their users
+    are in objects.
+
+    Generator: yields (meshes done, meshes) after every mesh and returns (objects moved, objects
+    skipped because of such shared meshes), so it can be run in chunks, see runner.py.
+    """
+    users = {}
+    for object in objects:
+        try:
+            if object.type != 'MESH' or object.data is None or object.data.library:
+                continue
+            users.setdefault(object.data.as_pointer(), []).append(object)
+        except ReferenceError:
+            continue
+
+    moved = 0
+    skipped = 0
+
+    for done, mesh_objects in enumerate(users.values(), 1):
+        yield done - 1, len(users)
+        mesh = mesh_objects[0].data
+        if mesh.users > len(mesh_objects):
+            skipped += len(mesh_objects)
+            continue
+
+        offset = geometry_center(mesh, center)
+        if offset is None or offset.length < ORIGIN_EPSILON:
+            continue
+
+        shift_mesh(mesh, -offset)
+        translation = Matrix.Translation(offset)
+        compensation = Matrix.Translation(-offset)
+
+        for object in mesh_objects:
+            object.matrix_basis = object.matrix_basis @ translation
+            for child in object.children:
+                child.matrix_parent_inverse = compensation @ child.matrix_parent_inverse
+            moved += 1
+
+    return moved, skipped
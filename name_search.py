@@ -0,0 +1,161 @@
+"""
+Object name index for the Replace pickers (object1/object2 search callbacks).
+
+All object names are kept lowercased and sorted, so a prefix is found with bisect, plus joined
+into a single string so a substring is found with str.find, instead of lowercasing and scanning
+every object on each keystroke. The names and their NameInfo come from the live registry
+(registry.py). The index is built from it once and then follows its log of added and removed
+names, so a change costs a bisect, not a rebuild. The joined string is made again on the next
+substring search after a change. The NameInfo of every name is kept next to it, so ranking
+reads nothing from Blender, and only the matches that are shown get sorted.
+
+Matches are ranked: same LOD as the other picker's object first, then same body part, then
+prefix matches before substring matches, then by name.
+"""
+
+import bisect
+import heapq
+
+from .naming import NameInfo
+from .registry import classify_name, registry, Registry
+
+# Most names a picker lists, Blender can't show more than a screenful anyway
+MAX_RESULTS = 300
+
+# Joins the lowercased names, can't be part of an object name typed in a search field
+SEPARATOR = "\n"
+
+
+class NameIndex:
+    """
+    Sorted, lowercased object names with prefix and substring lookups.
+
+    ---------
+    Methods:
+    ---------
+    update(self)
+        Applies the names the registry added and removed since the index last saw it. Returns
+        False when the registry no longer has them logged, the index has to be built again.
+
+    prefix(self, text)
+        Returns the names starting with text (case insensitive), in sorted order.
+
+    substring(self, text)
+        Returns the names containing text (case insensitive), in sorted order.
+
+    info(self, name)
+        Returns the NameInfo of a name, as the index has it.
+    """
+
+    def __init__(self, objects: Registry):
+        self.registry = objects
+        self.generation = objects.generation
+
+        # (lowercased name, name), sorted
+        self.keys = sorted((entry.name.lower(), entry.name) for entry in objects.entries.values())
+        self.infos: dict[str, NameInfo] = {entry.name: entry.info for entry in objects.entries.values()}
+        self.text = None
+        self.offsets = None
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def update(self) -> bool:
+        changes = self.registry.changes_since(self.generation)
+        if changes is None:
+            return False
+
+        for removed, added in changes:
+            if removed is not None:
+                key = (removed.lower(), removed)
+                position = bisect.bisect_left(self.keys, key)
+                if position < len(self.keys) and self.keys[position] == key:
+                    del self.keys[position]
+                self.infos.pop(removed, None)
+            if added is not None:
+                bisect.insort(self.keys, (added.lower(), added))
+                self.infos[added] = self.registered_info(added)
+
+        if changes:
+            self.text = None
+            self.offsets = None
+        self.generation = self.registry.generation
+        return True
+
+    def prefix(self, text: str) -> list[str]:
+        text = text.lower()
+        start = bisect.bisect_left(self.keys, (text,))
+        end = bisect.bisect_left(self.keys, (text + "\uffff",), lo=start)
+        return [name for _, name in self.keys[start:end]]
+
+    def substring(self, text: str) -> list[str]:
+        text = text.lower()
+        if not text:
+            return [name for _, name in self.keys]
+
+        if self.text is None:
+            self.join()
+
+        matches = []
+        last = -1
+        position = self.text.find(text)
+        while position != -1:
+            index = bisect.bisect_right(self.offsets, position) - 1
+            if index != last:
+                matches.append(self.keys[index][1])
+                last = index
+            # Carry on after the name that matched
+            position = self.text.find(text, self.offsets[index] + len(self.keys[index][0]) + len(SEPARATOR))
+        return matches
+
+    def info(self, name: str) -> NameInfo:
+        info = self.infos.get(name)
+        return info if info is not None else classify_name(name, False)
+
+    def registered_info(self, name: str) -> NameInfo:
+        """ NameInfo of a name from the registry entries, without asking Blender """
+        uid = self.registry.by_name.get(name)
+        entry = self.registry.entries.get(uid) if uid is not None else None
+        # The name may already be gone again further down the log
+        return entry.info if entry is not None and entry.name == name else classify_name(name, False)
+
+    def join(self) -> None:
+        """ The joined string and the offset of every name in it, to map str.find hits back to names """
+        self.text = SEPARATOR.join(lowered for lowered, _ in self.keys)
+        self.offsets = []
+        offset = 0
+        for lowered, _ in self.keys:
+            self.offsets.append(offset)
+            offset += len(lowered) + len(SEPARATOR)
+
+
+_index: NameIndex | None = None
+
+
+def name_index() -> NameIndex:
+    """ The current index, brought up to date with the registry first """
+    global _index
+    objects = registry()
+    if _index is None or _index.registry is not objects or not _index.update():
+        _index = NameIndex(objects)
+    return _index
+
+
+def search(edit_text: str, reference: str | None = None, limit: int = MAX_RESULTS) -> list[str]:
+    """ Object names matching edit_text, ranked against the reference name (the other picker's object) """
+    index = name_index()
+    prefixed = set(index.prefix(edit_text))
+    matches = index.substring(edit_text)
+
+    reference_info = index.info(reference) if reference else None
+
+    def rank(name: str):
+        info = index.info(name)
+        same_lod = reference_info is not None and info.lod == reference_info.lod
+        same_base = reference_info is not None and info.base == reference_info.base
+        return (not same_lod, not same_base, name not in prefixed, name.lower())
+
+    if reference_info is None:
+        # Already sorted by name, prefix matches go first
+        return heapq.nsmallest(limit, matches, key=lambda name: name not in prefixed)
+    return heapq.nsmallest(limit, matches, key=rank)
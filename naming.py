@@ -0,0 +1,147 @@
+"""
+Naming rules for Ghoul2 model parts.
+
+Everything in this module works on plain object names, so it can be used by the operators,
+by the scene index and by anything else that needs to know what an object is and where it
+belongs in the hierarchy without asking Blender for it.
+"""
+
+import re
+from typing import NamedTuple
+
+# Parent mapping
+parents_dict = {
+    "head": "torso",
+    "torso": "hips",
+    "hips": "model_root",
+    "l_arm": "torso",
+    "r_arm": "torso",
+    "l_hand": "l_arm",
+    "r_hand": "r_arm",
+    "l_leg": "hips",
+    "r_leg": "hips"
+}
+
+# Object roles
+ROLE_ROOT = "ROOT"
+ROLE_PART = "PART"
+ROLE_CAP = "CAP"
+ROLE_TAG = "TAG"
+ROLE_STUPIDTRIANGLE = "STUPIDTRIANGLE"
+
+LOD_PATTERN = re.compile(r"^(?P<stem>.+)_(?P<lod>\d+)$")
+
+
+class G2Properties(NamedTuple):
+    """ The Ghoul2 properties an object should have """
+    name: str
+    shader: str
+    off: bool | None    # None leaves g2_prop_off as it is
+    tag: bool
+
+
+class NameInfo(NamedTuple):
+    """ Everything the naming rules can tell about a single object name """
+    name: str
+    role: str
+    base: str           # body part the object belongs to, e.g. "l_arm"
+    lod: int | None     # numeric _N suffix, None when the name has none
+    side: str | None    # "l", "r" or None
+    parent: str | None  # name of the object this one should be parented to
+
+
+def split_lod(name: str) -> tuple[str, int | None]:
+    """ Split "l_arm_12" into ("l_arm", 12). Names without a numeric suffix get None as LOD. """
+    match = LOD_PATTERN.match(name)
+    if match:
+        return match.group("stem"), int(match.group("lod"))
+    return name, None
+
+
+def lod_name(stem: str | None, lod: int | None) -> str | None:
+    if stem is None or lod is None:
+        return None
+    return f"{stem}_{lod}"
+
+
+def parse_name(name: str) -> NameInfo:
+    """
+    Classify an object by its name and work out the name of its parent.
+
+    This follows the same rules the parenting operators always used:
+        - stupidtriangles are marked so they can be removed
+        - skeleton_root and model_root_N go under scene_root
+        - tags (*name_N) go under the body part they are attached to
+        - caps (part_cap_other_N) go under their own body part
+        - hips/torso/head, arms, hands and legs follow parents_dict
+        - extra pieces (torso_belt_N, l_arm_pad_N) go under the part they start with
+    """
+    stem, lod = split_lod(name)
+
+    if "stupidtriangle" in name:
+        return NameInfo(name, ROLE_STUPIDTRIANGLE, stem, lod, None, None)
+
+    if name == "scene_root":
+        return NameInfo(name, ROLE_ROOT, name, None, None, None)
+
+    if "skeleton_root" in name or "model_root" in name:
+        return NameInfo(name, ROLE_ROOT, stem, lod, None, "scene_root")
+
+    if name.startswith("*"):
+        return _parse_tag(name, stem, lod)
+
+    name_parts = stem.split("_")
+    side = name_parts[0] if name_parts[0] in {"l", "r"} and len(name_parts) > 1 else None
+
+    if "_cap_" in name:
+        base = f"{side}_{name_parts[1]}" if side else name_parts[0]
+        return NameInfo(name, ROLE_CAP, base, lod, side, lod_name(base, lod))
+
+    # legs, arms, hands and their extra pieces
+    if side:
+        base = f"{side}_{name_parts[1]}"
+        if len(name_parts) > 2:  # extra piece
+            return NameInfo(name, ROLE_PART, base, lod, side, lod_name(base, lod))
+        return NameInfo(name, ROLE_PART, base, lod, side, lod_name(parents_dict.get(base), lod))
+
+    # hips, torso, head
+    if len(name_parts) == 1:
+        return NameInfo(name, ROLE_PART, stem, lod, None, lod_name(parents_dict.get(stem), lod))
+
+    # Fallback: use first part of name
+    base = name_parts[0]
+    return NameInfo(name, ROLE_PART, base, lod, None, lod_name(base, lod))
+
+
+def _parse_tag(name: str, stem: str, lod: int | None) -> NameInfo:
+    name_parts = stem[1:].split("_")
+    base = name_parts[0]
+
+    # left and right check
+    if base in {"l", "r"} and len(name_parts) > 1:
+        parent_base = f"{base}_{name_parts[1]}"
+        return NameInfo(name, ROLE_TAG, parent_base, lod, base, lod_name(parent_base, lod))
+
+    if base == "hip":
+        parent_base = "torso"
+    elif base in {"hips", "head"}:
+        parent_base = base
+    else:
+        # fallback to torso
+        parent_base = "torso"
+
+    return NameInfo(name, ROLE_TAG, parent_base, lod, None, lod_name(parent_base, lod))
+
+
+def g2_properties(name: str) -> G2Properties:
+    """ Ghoul2 properties that follow from an object's name, g2_prop_name is the name without its LOD """
+    g2_name, _ = split_lod(name)
+    shader = "" # Used for MD3 as far as I know
+
+    if "_off" in g2_name:
+        return G2Properties(g2_name, shader, True, False)
+
+    if name.startswith("*"):
+        return G2Properties(g2_name, shader, None, True)
+
+    return G2Properties(g2_name, shader, False, False)
@@ -1,195 +1,187 @@
 import bpy
-import bmesh
-import json
 import os
 import re
 
-# Parent mapping
-parents_dict = {
-    "head": "torso",
-    "torso": "hips",
-    "hips": "model_root",
-    "l_arm": "torso",
-    "r_arm": "torso",
-    "l_hand": "l_arm",
-    "r_hand": "r_arm",
-    "l_leg": "hips",
-    "r_leg": "hips"
-}
-
-
-class OBJECT_OT_CreateTags(bpy.types.Operator):
+from .naming import split_lod, ROLE_CAP, ROLE_PART, ROLE_ROOT, ROLE_STUPIDTRIANGLE, ROLE_TAG
+from .deletion import DeletionQueue
+from .fingerprint import changed_objects, load_fingerprints, store_fingerprints
+from .g2_sync import sync_g2_properties, sync_steps
+from .lod_generation import generate_lods
+from .meshops import origin_steps, triangulate_meshes, triangulate_steps
+from .profiling import phase, profiled
+from .registry import registry
+from .runner import chunks, ChunkedOperator, stage
+from .parenting import apply_parenting, ParentingResult
+from .scene_index import SceneIndex
+from .scope import scope_members, scope_objects
+from .skin import parse_variants, write_skins
+from .tag_templates import default_tags_path, load_tag_templates, TagTemplate
+from .validation import ERROR, summary, validate
+from .vertex_groups import limit_weights_many, remove_empty_vertex_groups_many
+
+
+class OBJECT_OT_CreateTags(ChunkedOperator, bpy.types.Operator):
+    """
+    Create every tag from the chosen tag set (tags.json by default) for every model_root_N,
+    or only for the one LOD picked in the settings.
+
+    The tag file is read once and kept in memory (see tag_templates.py). Each tag is built once,
+    for the first LOD that misses it, every other LOD gets a copy of that object and its mesh.
+    Runs in cancellable chunks when started from the panel, see runner.py.
+    """
     bl_idname = "create.tags"
     bl_label = "Create Tags"
     bl_description = "Create all tags (if not existing yet)"
 
-    def execute(self, context):
-        addon_directory = os.path.dirname(os.path.realpath(__file__))
-        file_path = os.path.join(addon_directory, "tags.json")
+    def run(self, context):
+        file_path = bpy.path.abspath(context.scene.settings.tags_file) or default_tags_path()
 
         if not os.path.exists(file_path):
-            self.report({'ERROR'}, "Tags data file not found.")
-            return {'CANCELLED'}
+            return {'CANCELLED'}, 'ERROR', "Tags data file not found."
 
-        mesh_data_list = self.load_mesh_data(file_path)
+        with phase("load templates") as loading:
+            templates = load_tag_templates(file_path)
+            loading.objects = len(templates)
         model_roots = self.get_all_model_roots()
 
+        lod_filter = context.scene.settings.lod_filter
+        if lod_filter >= 0:
+            model_roots = [lod for lod in model_roots if lod == lod_filter]
+
         if not model_roots:
-            self.report({'WARNING'}, "No model_root objects found.")
-            return {'CANCELLED'}
+            return {'CANCELLED'}, 'WARNING', "No model_root objects found."
 
-        for lod in model_roots:
-            for mesh_data in mesh_data_list:
-                self.create_mesh_from_data(mesh_data, lod)
+        armature = bpy.data.objects.get("skeleton_root")
+        if not armature:
+            self.report({'WARNING'}, "No skeleton_root object found.")
 
-        self.report({'INFO'}, f"Tags created for {len(model_roots)} model_root(s).")
-        return {'FINISHED'}
-    
-    def load_mesh_data(self, file_path):
-        with open(file_path, 'r') as f:
-            return json.load(f)
+        created = 0
+        skipped = 0
+        with phase("build tags") as building:
+            for done, template in enumerate(templates):
+                yield done, len(templates)
+                source = None
+                for lod in model_roots:
+                    name = f"{template.name}_{lod}"
+                    if not self.name_unique_check(name):
+                        skipped += 1
+                        continue
 
-    def create_mesh_from_data(self, mesh_data, lod):
-        name = f"{mesh_data['name']}_{lod}"
-        if not self.name_unique_check(name):
-            return None
+                    if source is None:
+                        source = self.create_tag(template, name, armature)
+                    else:
+                        self.copy_tag(source, name)
+                    created += 1
+            building.objects = created
 
-        mesh = bpy.data.meshes.new(name)
-        bm = self.create_bmesh_from_mesh(mesh, mesh_data)
-        bm.to_mesh(mesh)
-        bm.free()
+        return {'FINISHED'}, 'INFO', f"{created} tag(s) created for {len(model_roots)} model_root(s), {skipped} already existed."
 
-        obj = self.create_object_with_meshdata(name, mesh, mesh_data)
-        self.apply_vertex_groups(obj, mesh_data)
-        self.set_armature_modifier(obj)
-        return obj
+    def create_tag(self, template: TagTemplate, name: str, armature: bpy.types.Object | None) -> bpy.types.Object:
+        mesh = bpy.data.meshes.new(name)
+        mesh.from_pydata(template.vertices, [], template.faces)
+        mesh.update()
 
-    def create_bmesh_from_mesh(self, mesh, mesh_data):
-        bm = bmesh.new()
-        vertex_map = {}
-        for vert in mesh_data['vertices']:
-            v = bm.verts.new(vert)
-            vertex_map[len(vertex_map)] = v
-        for face in mesh_data['faces']:
-            bm.faces.new([vertex_map[i] for i in face])
-        return bm
-    
-    def create_object_with_meshdata(self, name, mesh, mesh_data):
         obj = bpy.data.objects.new(name, mesh)
         bpy.context.scene.collection.objects.link(obj)
 
-        obj.scale = (obj.scale[0] / 10, obj.scale[1] / 10, obj.scale[2] / 10)
-        obj.data.transform(obj.matrix_world)
-        obj.matrix_world.identity()
-        self.apply_g2_properties(obj, mesh_data)
-        return obj    
+        self.apply_g2_properties(obj, template)
+        self.apply_vertex_groups(obj, template)
+        self.set_armature_modifier(obj, armature)
+        return obj
 
-    def set_armature_modifier(self, obj):
-        armature = bpy.data.objects.get("skeleton_root")
+    def copy_tag(self, source: bpy.types.Object, name: str) -> bpy.types.Object:
+        # Object copies keep their vertex groups, modifiers and g2 properties
+        obj = source.copy()
+        obj.data = source.data.copy()
+        obj.name = name
+        obj.data.name = name
+        bpy.context.scene.collection.objects.link(obj)
+        return obj
+
+    def set_armature_modifier(self, obj: bpy.types.Object, armature: bpy.types.Object | None) -> None:
         if armature:
             mod = obj.modifiers.new(name="Armature", type='ARMATURE')
             mod.object = armature
-        else:
-            self.report({'WARNING'}, "No skeleton_root object found.")
-
 
-    def name_unique_check(self, name):
-        if name in bpy.data.objects:
-            self.report({'INFO'}, f"Object '{name}' already exists, skipping creation.")
-            return False
-        return True
+    def name_unique_check(self, name: str) -> bool:
+        return name not in bpy.data.objects
 
-    def apply_vertex_groups(self, obj, mesh_data):
-        if 'vertex_groups' in mesh_data:
-            for group_name, vertices_weights in mesh_data['vertex_groups'].items():
-                vg = obj.vertex_groups.new(name=group_name)
-                for vw in vertices_weights:
-                    vg.add([vw['vertex_index']], vw['weight'], 'REPLACE')
+    def apply_vertex_groups(self, obj: bpy.types.Object, template: TagTemplate) -> None:
+        for group_name, weights in template.vertex_groups.items():
+            vg = obj.vertex_groups.new(name=group_name)
+            for weight, indices in weights:
+                vg.add(indices, weight, 'REPLACE')
 
     def get_all_model_roots(self):
         pattern = re.compile(r"^model_root_(\d+)$")
         model_roots = []
-        for obj in bpy.data.objects:
+        for obj in scope_objects():
             match = pattern.match(obj.name)
             if match:
                 model_roots.append(int(match.group(1)))
         return sorted(model_roots)
     
-    def apply_g2_properties(self, obj, mesh_data):
-        obj.g2_prop_name = mesh_data['name']
+    def apply_g2_properties(self, obj: bpy.types.Object, template: TagTemplate) -> None:
+        obj.g2_prop_name = template.name
         obj.g2_prop_shader = ""
         obj.g2_prop_off = False
         obj.g2_prop_tag = True
 
+################################################################################################
+##                                                                                            ##
+##                                      CREATE LODS                                           ##
+##                                                                                            ##
+################################################################################################
+
+class OBJECT_OT_CreateLODs(bpy.types.Operator):
+    """
+    Build model_root_1 .. model_root_N from the model_root_0 hierarchy in one step.
+
+    Every object below model_root_0 is copied with its vertex groups, armature modifier and
+    g2 properties, and renamed from _0 to _N. Body part meshes are decimated to
+    (LOD 0 triangles * ratio ** N), tags and caps share the LOD 0 mesh. See lod_generation.py.
+    Objects that already exist in a LOD are left as they are.
+    """
+    bl_idname = "create.lods"
+    bl_label = "Create LODs"
+    bl_description = "Create model_root_1 .. N as decimated copies of the model_root_0 hierarchy"
+
+    @profiled
+    def execute(self, context):
+        settings = context.scene.settings
+        source_root = bpy.data.objects.get("model_root_0")
+
+        if not source_root:
+            self.report({'ERROR'}, "No model_root_0 object found.")
+            return {'CANCELLED'}
+
+        lods = range(1, settings.lod_count + 1)
+        if settings.lod_filter > 0:
+            lods = [settings.lod_filter]
+
+        try:
+            created, skipped = generate_lods(source_root, lods, settings.lod_ratio)
+        except Exception as e:
+            print(f"[ISSUE] Exception {e} caught while creating LODs.")
+            self.report({'ERROR'}, f"Failed to create LODs: {e}")
+            return {'CANCELLED'}
+
+        context.view_layer.update()
+        self.report({'INFO'}, f"{created} object(s) created for {len(lods)} LOD(s), {skipped} already existed.")
+        return {'FINISHED'}
+
 class OBJECT_OT_TagParent(bpy.types.Operator):  
     bl_idname = "parent.tags"
     bl_label = "Parent Tags"
     bl_description = "Parent all tags to their respective parents."
 
+    @profiled
     def execute(self, context):
-        for object in bpy.data.objects:
-            try:
-                check_object_isinstance(object)
-
-                self.check_object(object)
-                
-                if self.should_skip(object):
-                    continue
-                                 
-                parent_object = self.get_parent(object)
-            
-                if parent_object:
-                    set_parent(object, parent_object)
-            except ReferenceError:
-                continue
+        index = SceneIndex.from_context(context)
+        report_parenting(self, apply_parenting(plan_tag_parents(index)))
                    
         return {'FINISHED'}
 
-    def get_parent(self, object: bpy.types.Object) -> bpy.types.Object:
-        
-        try:
-            name_parts = object.name[1:].split('_')
-            base = name_parts[0]
-            lod = name_parts[-1]
-            
-            # left check
-            if base in 'l':
-                return bpy.data.objects.get(f"l_{name_parts[1]}_{lod}")
-            
-            # right check
-            if base in 'r':
-                return bpy.data.objects.get(f"r_{name_parts[1]}_{lod}")
-            
-            if base in "hip":
-                return bpy.data.objects.get(f"torso_{lod}")
-
-            # hips check
-            if base in "hips":
-                return bpy.data.objects.get(f"hips_{lod}")
-            
-            #head check
-            if base in "head":
-                return bpy.data.objects.get(f"head_{lod}")
-                
-            # fallback to torso
-            return bpy.data.objects.get(f"torso_{lod}")
-        except Exception as e:
-            print(f"WARNING: {object.name} caused an unknown problem.")
-            
-    def should_skip(self, object: bpy.types.Object) -> bool:          
-        
-        # startswith * added as failsafe if tag object didn't get g2 props set 
-        if not object.g2_prop_tag or not object.name.startswith("*"):
-            return True
-        
-        return False
-
-    def check_object(self, object: bpy.types.Object) -> None: 
-        if not isinstance(object, bpy.types.Object):
-            raise TypeError(f"{object.name} must be an Object.")
-        
-        set_g2_properties(self, object)        
-
 ################################################################################################
 ##                                                                                            ##
 ##                                  SET BODY PARENTING                                        ##
@@ -201,86 +193,22 @@ class OBJECT_OT_BodyParent(bpy.types.Operator):
     A class that parents all objects to their respective parents. (it will ignore some if the parent is not found).
     Also, it will check if the objects have non-triangulated faces and apply triangulate if needed.
     
-    ---------
-    Methods:
-    ---------
-    get_parent(self, object)
-        This takes an object and does a simple algorithm to find a suitable parent.
-    
-    set_parent(self, child, parent)
-        This takes the child and parent (found with get_parent) object and does the actual parenting.
-        
-    should_skip(self, object)
-        This runs a check if it is a stupidtriangle or a specific reason to skip the current object.
-        If none of these have a reason to skip, it will return False so the main function continues. 
+    Parents are looked up in a SceneIndex, which parses every object name once (see naming.py).
+    Stupidtriangles are deleted in one go afterwards, tags, caps and scene_root are left alone.
     """
     
     bl_idname = "parent.objects"
     bl_label = "Parent Objects"
     bl_description = "Parent all objects to their respective parents and apply triangulate if needed."
 
+    @profiled
     def execute(self, context):
-          # Clears the console (Windows only)
-
-        for object in bpy.data.objects:
-            try:
-                check_object_isinstance(object)
-
-                if self.should_skip(object):
-                    continue
-                
-                if object.type == 'MESH':
-                    triangulate(object)
-                
-                parent_object = self.get_parent(object)
-                
-                if parent_object:
-                    set_parent(object, parent_object)
-            except Exception as e:
-                print(f"[ISSUE] Exception {e} caught. Research it, fix the issue, try again.")
+        index = SceneIndex.from_context(context)
+        queue = DeletionQueue(index.role(ROLE_STUPIDTRIANGLE))
+        report_parenting(self, apply_parenting(plan_body_parents(index)))
+        queue.flush(purge=context.scene.settings.purge_orphans)
                                 
         return {'FINISHED'}
-       
-    def get_parent(self, child: bpy.types.Object) -> bpy.types.Object:
-      
-        name_parts = child.name.split("_")
-        
-        try: 
-            # Root objects
-            if "skeleton_root" in child.name or "model_root" in child.name:
-                return bpy.data.objects.get("scene_root")
-
-            # hips, torso, head
-            if len(name_parts) > 1 and name_parts[1].isnumeric():
-                parent_key = child.name[:-2]
-                return bpy.data.objects.get(f"{parents_dict[parent_key]}_{child.name[-1]}")
-
-            # legs, arms, hands
-            if child.name.startswith(("l_", "r_")):
-                if len(name_parts) > 3:  # extra piece
-                    return bpy.data.objects.get(f"{name_parts[0]}_{name_parts[1]}_{child.name[-1]}")
-                
-                else:
-                    parent_key = child.name[:-2]
-                    return bpy.data.objects.get(f"{parents_dict[parent_key]}_{child.name[-1]}")
-
-            # Fallback: use first part of name
-            else:
-                return bpy.data.objects.get(f"{name_parts[0]}_{child.name[-1]}")
-        except Exception as e:
-            print(f"[ISSUE] Exception {e} caught. Research it, fix the issue, try again.")
-                                      
-    def should_skip(self, object: bpy.types.Object) -> bool:                
-        if "stupidtriangle" in object.name:
-            object.select_set(True)
-            bpy.ops.object.delete(use_global=True, confirm=True)
-            print(f"{object.name} deleted.")
-            return True
-        
-        if object.g2_prop_tag or object.name == "scene_root" or "_cap_" in object.name:
-            return True
-        
-        return False
     
     
 ################################################################################################
@@ -294,70 +222,21 @@ class OBJECT_OT_CapParent(bpy.types.Operator):
     A class that parents all caps to their respective parents. (it will ignore some if the parent is not found).
     Also, it will check if the caps have non-triangulated faces and apply triangulate if needed.
     
-    ---------
-    Methods:
-    ---------
-    get_parent(self, object)
-        This takes an object and does a simple algorithm to find a suitable parent.
-    
-    set_parent(self, child, parent)
-        This takes the child and parent (found with get_parent) object and does the actual parenting.
-        
-    should_skip(self, object)
-        This runs a check if it is a stupidtriangle or a specific reason to skip the current object.
-        If none of these have a reason to skip, it will return False so the main function continues. 
+    Parents are looked up in a SceneIndex, a cap always goes under its own body part of the same LOD.
     """
     
     bl_idname = "parent.caps"
     bl_label = "Parent Caps"
     bl_description = "Parent all caps to their respective parents and apply triangulate if needed."
     
+    @profiled
     def execute(self, context):
-
-        for object in bpy.data.objects:
-            try:
-                check_object_isinstance(object)
-
-                if self.should_skip(object):
-                    continue
-                
-                if object.type == 'MESH':
-                    triangulate(object)
-                    
-                    parent_object = self.get_parent(object)
-                    
-                    if parent_object:
-                        set_parent(object, parent_object)
-                    else:
-                        print(f"WARNING: Parent not found for {object.name}.")
-                        
-            except ReferenceError:
-                continue
-            except Exception as e:
-                print(f"[ISSUE] Exception {e} caught. Research it, fix the issue, try again.")
+        index = SceneIndex.from_context(context)
+        queue = DeletionQueue(index.role(ROLE_STUPIDTRIANGLE))
+        report_parenting(self, apply_parenting(plan_cap_parents(index)))
+        queue.flush(purge=context.scene.settings.purge_orphans)
                                     
         return {'FINISHED'}
-      
-    def get_parent(self, child: bpy.types.Object) -> bpy.types.Object:
-        
-        name_parts = child.name.split("_")
-        
-        if name_parts[0] in {"l", "r"}:
-            return bpy.data.objects.get(f"{name_parts[0]}_{name_parts[1]}_{name_parts[-1]}")
-        
-        return bpy.data.objects.get(f"{name_parts[0]}_{name_parts[-1]}")
-
-    def should_skip(self, object: bpy.types.Object) -> bool:                
-        if "stupidtriangle" in object.name:
-            print(f"{object.name} deleted.")
-            object.select_set(True)
-            bpy.ops.object.delete(use_global=True, confirm=True)
-            return True
-        
-        if "_cap_" not in object.name or object.g2_prop_tag:
-            return True
-        
-        return False
 
 
 ################################################################################################
@@ -366,17 +245,60 @@ class OBJECT_OT_CapParent(bpy.types.Operator):
 ##                                                                                            ##
 ################################################################################################
 
-class OBJECT_OT_AllParent(bpy.types.Operator):
+class OBJECT_OT_AllParent(ChunkedOperator, bpy.types.Operator):
+    """
+    Parent objects, tags and caps from a single SceneIndex instead of scanning the scene three times.
+    
+    With "Only changed objects" enabled, only objects that were added, renamed or changed since the
+    last run (and the objects that belong under them) are processed, see fingerprint.py.
+    
+    Runs in cancellable chunks when started from the panel, see runner.py: the triangulation,
+    the g2 properties and the parenting each go a chunk at a time. Every chunk keeps the world
+    transforms, so cancelling leaves a half parented but unmoved scene.
+    """
     
     bl_idname = "parent.all"
     bl_label = "Parent All"
     bl_description = "Parent everything at once."
-
-    def execute(self, context):
-        bpy.ops.parent.objects()
-        bpy.ops.parent.tags()
-        bpy.ops.parent.caps()
-        return {'FINISHED'}  
+    
+    force_full: bpy.props.BoolProperty(name="Force full", default=False, options={'SKIP_SAVE'}, description="Process every object, even when only changed objects are enabled")
+
+    def run(self, context):
+        index = incremental_index(self, context, self.bl_idname)
+        queue = DeletionQueue(index.role(ROLE_STUPIDTRIANGLE))
+        body = body_objects(index)
+        caps = cap_objects(index)
+        everything = index.all()
+
+        # Tags whose g2 properties aren't set yet only count once the pairs are planned
+        meshes = len(body) + len(caps)
+        total = meshes + len(everything) + len(body) + len(tag_objects(index)) + len(caps)
+
+        with phase("triangulate", meshes):
+            _, context = yield from stage(triangulate_steps(body + caps), 0, total)
+        _, context = yield from stage(sync_steps(everything), meshes, total)
+        done = meshes + len(everything)
+
+        pairs = parent_pairs(index, body) + parent_pairs(index, tag_objects(index)) + parent_pairs(index, caps)
+        total = done + len(pairs)
+        parented = unchanged = missing = 0
+
+        for offset, chunk in chunks(pairs):
+            context = yield done + offset, total
+            # World matrices stay valid between chunks, the view layer is updated once at the end
+            result = apply_parenting(chunk, update=False)
+            parented += result.parented
+            unchanged += result.unchanged
+            missing += result.missing
+        context = yield total, total
+
+        with phase("depsgraph update"):
+            context.view_layer.update()
+
+        report_parenting(self, ParentingResult(parented, unchanged, missing))
+        queue.flush(purge=context.scene.settings.purge_orphans)
+        store_fingerprints(context.scene, self.bl_idname, index.objects.values())
+        return {'FINISHED'}, 'INFO', None
     
     
 ################################################################################################
@@ -393,12 +315,13 @@ class SetG2Properties(bpy.types.Operator):
     If you want to set a custom shader, change g2_prop_shader after using this function or it will be
     overwritten by emptiness.
     
+    The target properties of every object are worked out first, then only the ones that differ
+    are written (see g2_sync.py), so running it again on a clean scene writes nothing. A dry run
+    only lists the changes it would make.
+    
     ---------
     Methods:
     ---------
-    set_g2_properties(self, object)
-        This takes an object and sets any Ghoul2 property to what it should be.
-        
     should_skip(self, object)
         This runs a check if it is a stupidtriangle or a specific reason to skip the current object.
         If none of these have a reason to skip, it will return False so the main function continues. 
@@ -407,26 +330,44 @@ class SetG2Properties(bpy.types.Operator):
     bl_idname = "set.g2properties"
     bl_label = "Set G2 Properties"
     bl_description = "Set all Ghoul2 properties"
+    
+    force_full: bpy.props.BoolProperty(name="Force full", default=False, options={'SKIP_SAVE'}, description="Process every object, even when only changed objects are enabled")
+    dry_run: bpy.props.BoolProperty(name="Dry run", default=False, options={'SKIP_SAVE'}, description="Only list the properties that would change, write nothing")
 
+    @profiled
     def execute(self, context):
+        index = incremental_index(self, context, self.bl_idname)
+        objects = []
         
-        
-        for object in bpy.data.objects:
+        for object in index.all():
             try:
                 check_object_isinstance(object)
 
                 if self.should_skip(object):
                     continue
                 
-                set_g2_properties(object)
+                objects.append(object)
             except ReferenceError:
                 continue
-                                     
+        
+        changes, writes = sync_g2_properties(objects, dry_run=self.dry_run)
+        
+        if self.dry_run:
+            for change in changes:
+                print(f"{change.object}: {change.property} {change.old!r} -> {change.new!r}")
+            self.report({'INFO'}, f"{len(changes)} propert(ies) of {len({change.object for change in changes})} object(s) would change, {len(objects)} object(s) checked.")
+            return {'FINISHED'}
+        
+        store_fingerprints(context.scene, self.bl_idname, index.objects.values())
+        
+        self.report({'INFO'}, f"{writes} propert(ies) written, {len(objects)} object(s) checked.")
         return {'FINISHED'}
         
     def should_skip(self, object: bpy.types.Object) -> bool:        
+        if "stupidtriangle" in object.name:
+            return True
 
-        if object.type != 'MESH' or object.type != 'ARMATURE':
+        if object.type not in {'MESH', 'ARMATURE'}:
             return True
         
         return False
@@ -444,9 +385,10 @@ class OBJECT_OT_UnparentAll(bpy.types.Operator):
     bl_idname = "remove.parent"
     bl_label = "Unparent All"
 
+    @profiled
     def execute(self, context):
         
-        for object in bpy.data.objects:
+        for object in scope_objects(context):
             try:
                 matrixcopy = object.matrix_world.copy()
             except ReferenceError:
@@ -470,15 +412,19 @@ class OBJECT_OT_Clean(bpy.types.Operator):
     bl_idname = "clean.hierarchy"
     bl_label = "Clean duplicates"
 
+    @profiled
     def execute(self, context): 
+        queue = DeletionQueue()
 
-        for object in bpy.data.objects:
+        for object in scope_objects(context):
             try:
                 if ".00" in object.name:
-                    object.select_set(True)
-                    bpy.ops.object.delete(use_global=True, confirm=True)
+                    queue.add(object)
             except ReferenceError:
                 continue
+        
+        removed = queue.flush(purge=context.scene.settings.purge_orphans)
+        self.report({'INFO'}, f"{removed} duplicate(s) deleted.")
        
         return {'FINISHED'}
 
@@ -489,7 +435,10 @@ class OBJECT_OT_Clean(bpy.types.Operator):
 ################################################################################################
 
 class OBJECT_OT_CreateSkinFile(bpy.types.Operator):
-    """ Create a model_default.skin file """
+    """ 
+    Create a model_default.skin file, or one model_<variant>.skin per variant when variants are given
+    (e.g. "default, red=_red, blue=_blue"). All variants are written in a single pass, see skin.py.
+    """
     bl_idname = "create.skinfile"
     bl_label = "Create .SKIN"
     
@@ -518,94 +467,66 @@ class OBJECT_OT_CreateSkinFile(bpy.types.Operator):
         col = split.column()
         col.prop(props, "modelname", text="")
 
+        split = layout.split(factor=0.3)
+        col = split.column()
+        col.label(text="Variants:")
+        col = split.column()
+        col.prop(props, "skin_variants", text="")
+
+    @profiled
     def execute(self, context):       
         props = context.scene.settings
         path = bpy.path.abspath(props.folder_path)
-        shadername = props.shadername
-        modelname = props.modelname
+        variants = parse_variants(props.skin_variants, props.shadername)
             
         try:
-            with open(path + f"/model_{shadername}.skin", "w") as file: 
-                modelparts = []
-                caps = []
-                roots = ("skeleton_root", "model_root", "scene_root")
-
-                for object in bpy.data.objects:
-                    try:
-                        check_object_isinstance(object)
-
-                        # Skip model_root, scene_root and skeleton_root, tags and objects without an active_material set.
-                        if object.type != "MESH":
-                            continue
-
-                        if object.g2_prop_tag:
-                            continue
-
-                        if not object.name.endswith("_0"):
-                            continue
-
-                        if any(root in object.name for root in roots):
-                            continue
-                        
-                        if object.g2_prop_off and "_cap_" in object.name:
-                            caps.append(f"{object.g2_prop_name},models/players/stormtrooper/caps.tga")
-                            continue
-                        
-                        texture = self.get_image(object)
-                        if texture:
-                            texture = re.sub(r'\.\d+$', '', texture)
-                            texture = os.path.basename(texture)
-                            texture = os.path.splitext(texture)[0]
-                        materialname = texture if texture else None
-                        modelparts.append(f"{object.g2_prop_name},models/players/{modelname}/{materialname}.tga")
-                    except ReferenceError:
-                        continue
-                
-                model_lines = modelparts + caps
-
-                output = self.write_output(model_lines)
-                
-                # Write to the file
-                file.write(output)
-
-            self.report({'INFO'}, "model_default.skin created.")
+            paths = write_skins(scope_objects(context), path, props.modelname, variants)
+            self.report({'INFO'}, f"{', '.join(os.path.basename(path) for path in paths)} created.")
             
             return {'FINISHED'}
         
         except Exception as e:
             self.report({'ERROR'}, f"Failed to create .skin file: {e}")
             return {'CANCELLED'}
-    
-    def write_output(self, model: list):
-        output = ""
-        for part in model:
-            output += f"{part}\n"
-        return output
 
     def invoke(self, context, event) -> None:
         return context.window_manager.invoke_props_dialog(self)
-    
-    def get_image(self, object: bpy.types.Object) -> str | None:
-        material = getattr(object, "active_material", None)
-        if not material:
-            return None
+        
+
+################################################################################################
+##                                                                                            ##
+##                                       VALIDATE MODEL                                       ##
+##                                                                                            ##
+################################################################################################
 
-        node_tree = getattr(material, "node_tree", None)
-        if not node_tree:
-            return None
+class OBJECT_OT_Validate(bpy.types.Operator):
+    """
+    Check the scene (or the LOD picked in the settings) for everything ModView and the game
+    refuse to load: empty g2 names, unparented objects, n-gons, more than 4 weights per vertex,
+    too many bones, vertices or triangles per surface and LODs missing surfaces of LOD 0.
+    See validation.py. The problems are listed in the panel and printed to the console.
+    """
+    bl_idname = "validate.model"
+    bl_label = "Validate Model"
+    bl_description = "Check the model for problems that keep it from loading in game"
 
-        image_node = next((node for node in node_tree.nodes if getattr(node, "type", "") == "TEX_IMAGE"), None)
-        image = getattr(image_node, "image", None)
-        filepath = getattr(image, "filepath", None)
-        if not filepath:
-            return None
+    @profiled
+    def execute(self, context):
+        index = SceneIndex.from_context(context)
+        problems = validate(index, bpy.data.objects.get("skeleton_root"))
 
-        texture = filepath.replace("\\", "/")
-        if "base/" in texture:
-            return texture.split("base/", 1)[1]
+        for problem in problems:
+            print(f"[ISSUE] {problem.severity} {problem.object}: {problem.message}")
 
-        return texture
-        
+        errors = sum(1 for problem in problems if problem.severity == ERROR)
+        warnings = len(problems) - errors
+
+        if not problems:
+            self.report({'INFO'}, f"No problems found in {len(index)} object(s).")
+        else:
+            counts = ", ".join(f"{check}: {count}" for check, count in summary(problems).items())
+            self.report({'ERROR'} if errors else {'WARNING'}, f"{errors} error(s), {warnings} warning(s) ({counts}).")
+        return {'FINISHED'}
 
 ################################################################################################
 ##                                                                                            ##
@@ -614,32 +535,42 @@ class OBJECT_OT_CreateSkinFile(bpy.types.Operator):
 ################################################################################################
 
 class OBJECT_OT_SelectObjectType(bpy.types.Operator):
-    """ Select all (caps/tags/objects) or both """
+    """
+    Select all (caps/tags/objects) or both. The objects come straight from the groups of the
+    live registry (see registry.py), nothing is classified again.
+    """
     
     bl_idname = "select.object_type"
     bl_label = "Model part select"
     
+    @profiled
     def execute(self, context): 
         
         bpy.ops.object.select_all(action='DESELECT')
         
         settings = bpy.context.scene.settings
+        objects = registry()
+        candidates = []
+        
+        if settings.meshes:
+            candidates += objects.group(ROLE_PART) + objects.group(ROLE_ROOT) + objects.group(ROLE_STUPIDTRIANGLE)
+        
+        if settings.tags:
+            candidates += [object for object in objects.group(ROLE_TAG) if object.g2_prop_tag]
+        
+        if settings.caps:
+            candidates += [object for object in objects.group(ROLE_CAP) if object.g2_prop_off]
+        
+        in_scope = scope_members(context)
             
-        for object in bpy.data.objects:
+        for object in candidates:
             try:
                 check_object_isinstance(object)
 
-                if self.should_skip(object):
+                if object.session_uid not in in_scope or self.should_skip(object):
                     continue
                 
-                if settings.meshes and (not object.g2_prop_tag and "_cap_" not in object.name):
-                    object.select_set(True)
-                
-                if settings.tags and object.g2_prop_tag:
-                    object.select_set(True)
-                
-                if settings.caps and object.g2_prop_off and "_cap_" in object.name:
-                    object.select_set(True)
+                object.select_set(True)
             except ReferenceError:
                 continue
             except Exception as e:
@@ -668,11 +599,13 @@ class OBJECT_OT_SetArmature(bpy.types.Operator):
     bl_label = "Set Armature Modifier"
     bl_description = "Setup an armature modifier with skeleton_root"
     
+    @profiled
     def execute(self, context): 
         
         skeleton_root = bpy.data.objects.get("skeleton_root")
+        self.queue = DeletionQueue()
 
-        for object in bpy.data.objects:
+        for object in scope_objects(context):
             try:
                 if not check_object_isinstance(object):
                     continue
@@ -691,13 +624,13 @@ class OBJECT_OT_SetArmature(bpy.types.Operator):
             except ReferenceError:
                 continue
         
+        self.queue.flush(purge=context.scene.settings.purge_orphans)
+        
         return {'FINISHED'}
     
     def should_skip(self, object: bpy.types.Object) -> bool:        
         if "stupidtriangle" in object.name:
-            print(f"{object.name} deleted.")
-            object.select_set(True)
-            bpy.ops.object.delete(use_global=True, confirm=True)
+            self.queue.add(object)
             return True
         
         if object.type != 'MESH':
@@ -711,61 +644,51 @@ class OBJECT_OT_SetArmature(bpy.types.Operator):
 ##                                                                                            ##
 ################################################################################################         
     
-class OBJECT_OT_RemoveEmptyVertexGroups(bpy.types.Operator):
+class OBJECT_OT_RemoveEmptyVertexGroups(ChunkedOperator, bpy.types.Operator):
     """
     This class will check every object for empty vertex groups.
+    A group is empty when it has less than 5 vertices or a total weight below 0.1.
+    Runs in cancellable chunks when started from the panel, see runner.py.
     """
     
     bl_idname = "remove.emptyvgroups"
     bl_label = "Remove Empty VGroups"
     
-    def execute(self, context):      
-        for object in bpy.data.objects:
+    def run(self, context):      
+        meshes = []
+        self.queue = DeletionQueue()
+        
+        for object in scope_objects(context):
             try:
                 check_object_isinstance(object)
                 
                 if self.should_skip(object):
                     continue
                 
-                self.remove_vertex_groups(object)
+                meshes.append(object)
             except ReferenceError:
                 continue
-            except Exception as e:
-                print(f"[ISSUE] Exception {e} caught while removing vertex groups.")
-    
-        return {'FINISHED'}
+        
+        self.queue.flush(purge=context.scene.settings.purge_orphans)
+        
+        removed = changed = 0
+        
+        try:
+            with phase("vertex groups", len(meshes)):
+                for done, chunk in chunks(meshes):
+                    yield done, len(meshes)
+                    chunk_removed, chunk_changed = remove_empty_vertex_groups_many(chunk)
+                    removed += chunk_removed
+                    changed += chunk_changed
+        except Exception as e:
+            print(f"[ISSUE] Exception {e} caught while removing vertex groups.")
+            return {'CANCELLED'}, 'ERROR', f"Failed to remove vertex groups: {e}"
+        
+        return {'FINISHED'}, 'INFO', f"Removed {removed} empty vertex group(s) from {changed} object(s)."
     
-    def remove_vertex_groups(self, object: bpy.types.Object) -> None:                   
-        # List to store vertex groups to remove
-        vertex_groups_to_remove = []
-
-        # Iterate through the vertex groups
-        for vgroup in object.vertex_groups:
-            # Initialize the count and weight sum for this vertex group
-            count = 0
-            weight_sum = 0.0
-            
-            # Count the number of vertices assigned to this vertex group and their weights
-            for vertex in object.data.vertices:
-                for group in vertex.groups:
-                    if group.group == vgroup.index:
-                        count += 1
-                        weight_sum += group.weight  # Get the weight of the vertex for this group
-                        break  # No need to check other groups for this vertex
-            
-            # Check the conditions: count < 5 or weight_sum < 0.50
-            if count < 5 or weight_sum < 0.100:
-                vertex_groups_to_remove.append(vgroup)
-
-        # Remove the empty vertex groups
-        for vgroup in vertex_groups_to_remove:
-            object.vertex_groups.remove(vgroup)
-
     def should_skip(self, object: bpy.types.Object) -> bool:      
         if "stupidtriangle" in object.name:
-            print(f"{object.name} deleted.")
-            object.select_set(True)
-            bpy.ops.object.delete(use_global=True, confirm=True)
+            self.queue.add(object)
             return True
         
         if object.type != 'MESH' or "root" in object.name:
@@ -773,6 +696,44 @@ class OBJECT_OT_RemoveEmptyVertexGroups(bpy.types.Operator):
         
         return False       
 
+################################################################################################
+##                                                                                            ##
+##                                  LIMIT BONE WEIGHTS                                        ##
+##                                                                                            ##
+################################################################################################
+
+class OBJECT_OT_LimitBoneWeights(bpy.types.Operator):
+    """
+    Ghoul2 allows 4 bone weights per vertex. This keeps the strongest weights of every vertex
+    (4 by default), drops the ones below the threshold and normalizes the rest, for every mesh
+    of the scene (or of the LOD picked in the settings). Vertex groups that aren't named after a
+    bone of skeleton_root are left alone. See vertex_groups.limit_weights.
+    """
+
+    bl_idname = "limit.boneweights"
+    bl_label = "Limit Bone Weights"
+    bl_description = "Keep the strongest 4 bone weights per vertex, prune tiny ones and normalize"
+
+    @profiled
+    def execute(self, context):
+        settings = context.scene.settings
+        index = SceneIndex.from_context(context)
+        meshes = [object for object in index.role(ROLE_PART) + index.role(ROLE_CAP) + index.role(ROLE_TAG) if object.type == 'MESH']
+
+        armature = bpy.data.objects.get("skeleton_root")
+        bones = {bone.name for bone in armature.data.bones} if armature and armature.type == 'ARMATURE' else None
+
+        try:
+            with phase("weights", len(meshes)):
+                vertices, changed = limit_weights_many(meshes, settings.weight_limit, settings.weight_threshold, bones)
+        except Exception as e:
+            print(f"[ISSUE] Exception {e} caught while limiting weights.")
+            self.report({'ERROR'}, f"Failed to limit bone weights: {e}")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Limited the weights of {vertices} vertices in {changed} mesh(es).")
+        return {'FINISHED'}
+
 ################################################################################################
 ##                                                                                            ##
 ##                                CREATE SCENE/MODEL ROOT                                     ##
@@ -784,6 +745,7 @@ class OBJECT_OT_CreateRoot(bpy.types.Operator):
     bl_idname = "create.root"
     bl_label = "Create Model/Scene"
     
+    @profiled
     def execute(self, context): 
         scene_collection = bpy.context.scene.collection
 
@@ -809,24 +771,28 @@ class OBJECT_OT_CreateRoot(bpy.types.Operator):
 ##                                                                                            ##
 ################################################################################################
     
-class OBJECT_OT_OrigintoGeometry(bpy.types.Operator):
-    """ Set Origin to Geometry on all objects """
+class OBJECT_OT_OrigintoGeometry(ChunkedOperator, bpy.types.Operator):
+    """
+    Set Origin to Geometry on all objects. The centers are computed with NumPy and the meshes
+    and object matrices are shifted directly (see meshops.origin_steps), so nothing
+    moves in the world, children included, and the selection stays as it is.
+    Runs in cancellable chunks when started from the panel, see runner.py.
+    """
     
     bl_idname = "origin.geometry"
     bl_label = "Set Origin to Geometry"
     
-    def execute(self, context): 
+    def run(self, context): 
+        objects = [object for object in scope_objects(context) if object.type == 'MESH']
 
-        for object in bpy.context.scene.objects:
-            if object.type == 'MESH':
-                bpy.context.view_layer.objects.active = object
-                object.select_set(True)
-                bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='BOUNDS')
-                object.select_set(False)
+        with phase("origins", len(objects)):
+            (moved, skipped), context = yield from stage(origin_steps(objects, context.scene.settings.origin_center))
+        context.view_layer.update()
                 
-        print("Origin to Geometry set on all objects.")
+        if skipped:
+            return {'FINISHED'}, 'WARNING', f"Origin set on {moved} object(s), {skipped} skipped: their mesh is also used outside the scope."
         
-        return {'FINISHED'} 
+        return {'FINISHED'}, 'INFO', f"Origin to Geometry set on {moved} object(s)."
 
 class OBJECT_OT_ReplaceObject(bpy.types.Operator):
     """
@@ -836,152 +802,247 @@ class OBJECT_OT_ReplaceObject(bpy.types.Operator):
     It will rename object 2 to the name of object 1, it will also parent object 2 to the parent of
     object 1. Then it will see what children object 1 has and parent those to object 2.
     
+    Besides a single pair, the replace mode can pair every LOD of object 1 with the same LOD of
+    object 2 (head_N with newhead_N), or every object whose name contains a text with the object
+    named after replacing that text (head_ -> newhead_). All reparents of all pairs are planned
+    first and applied in one batch, world transforms stay where they are.
+    
     ------
     METHODS:
     ------
         
-        copy_parenting(self, object1, object2):
-            This will copy every parent-child relations of object1 to object2 while
-            keeping the previous hierarchy of object2's children intact.
+        replace_pairs(self, settings):
+            Returns the (object 1, object 2) pairs the replace mode asks for.
+        
+        plan_parenting(self, pairs):
+            Returns every (child, parent) change that copies the parent-child relations of
+            each object 1 to its object 2, while keeping the previous hierarchy of object 2's
+            children intact.
     """
     
     bl_idname = "object.replace_object"
     bl_label = "Replace Object"
     bl_description = "Replace Object 1 with Object 2 (Rename & Take over child-parent relations)"
 
+    @profiled
     def execute(self, context):
         props = context.scene.settings
-        object1_name = props.object1
-        object2_name = props.object2
         action = props.action
 
-        if object1_name == "" or object2_name == "":
-            self.report({'ERROR'}, "Please select both objects")
+        pairs = self.replace_pairs(props)
+        if isinstance(pairs, str):
+            self.report({'ERROR'}, pairs)
             return {'CANCELLED'}
 
-        if object1_name == object2_name:
-            self.report({'ERROR'}, "Cannot replace an object with itself")
+        if not pairs:
+            self.report({'ERROR'}, "Nothing to replace")
             return {'CANCELLED'}
 
-        object1 = bpy.data.objects[object1_name]
-        object2 = bpy.data.objects[object2_name]
+        plan = self.plan_parenting(pairs)
+        if action == 'UNPARENT':
+            plan += [(object1, None) for object1, _ in pairs]
+        apply_parenting(plan, unparent=True)
 
-        if not object1 or not object2:
-            self.report({'ERROR'}, "Objects not found")
-            return {'CANCELLED'}
-        
-        if action == 'DELETE':
-            self.copy_parenting(object1, object2)
+        # Old objects get out of the way first, so object 2 can take the name without a .001
+        old_names = [object1.name for object1, _ in pairs]
+        new_names = [object2.name for _, object2 in pairs]
+        queue = DeletionQueue()
 
-            old_name = object1.name
-            bpy.data.objects.remove(object1)  # delete Object 1
-            object2.name = old_name           # rename Object 2
+        for object1, _ in pairs:
+            if action == 'DELETE':
+                queue.add(object1)
+            else:
+                object1.name = f"replaced_{object1.name}"
 
-        elif action == 'UNPARENT':
-            self.copy_parenting(object1, object2)
-            
-            old_name = object1.name
-            print(f"Object 1 old name: {old_name}")
-            print(f"Object 2 old name: {object2.name}")
-            object1.name = f"replaced_{old_name}"
-            object2.name = old_name           # rename Object 2
-            print(f"Object 2 new name: {object2.name}")
-            
-            matrixcopy = object1.matrix_world.copy()
-            object1.parent = None 
-            object1.matrix_world = matrixcopy
-            
-            
-        elif action == 'KEEP':
-            self.copy_parenting(object1, object2)
-            
-            old_name = object1.name
-            object1.name = f"replaced_{old_name}"
+        queue.flush(purge=props.purge_orphans)
+
+        for (_, object2), old_name in zip(pairs, old_names):
             object2.name = old_name           # rename Object 2
-            
 
-        self.report({'INFO'}, f"Replaced {object1_name} with {object2_name}")
-        return {'FINISHED'}  
-    
-    def copy_parenting(self, object1: bpy.types.Object, object2: bpy.types.Object) -> None:            
-        old_parent1 = object1.parent
-        old_parent2 = object2.parent
+        if len(pairs) == 1:
+            self.report({'INFO'}, f"Replaced {old_names[0]} with {new_names[0]}")
+        else:
+            self.report({'INFO'}, f"Replaced {len(pairs)} objects")
+        return {'FINISHED'}
 
-        def reparent_preserve_world(child: bpy.types.Object, parent: bpy.types.Object | None):
-            matrixcopy = child.matrix_world.copy()
-            child.parent = parent
-            child.matrix_world = matrixcopy
+    def replace_pairs(self, settings) -> list | str:
+        """ The (object 1, object 2) pairs to replace, or an error message """
+        objects = bpy.data.objects
+        mode = settings.replace_mode
 
-        # Reparent children of object2 to their previous parent to leave object2 free
-        for child in list(object2.children):
-            if child is object1:
+        if mode == 'PATTERN':
+            if not settings.replace_from:
+                return "Please enter the text to replace"
+
+            names = [object.name for object in scope_objects() if settings.replace_from in object.name]
+            pairs = [(name, name.replace(settings.replace_from, settings.replace_to, 1)) for name in names]
+            pairs = [(name1, name2) for name1, name2 in pairs if name2 in objects and name1 != name2]
+        else:
+            object1_name = settings.object1
+            object2_name = settings.object2
+
+            if object1_name == "" or object2_name == "":
+                return "Please select both objects"
+
+            if object1_name == object2_name:
+                return "Cannot replace an object with itself"
+
+            if object1_name not in objects or object2_name not in objects:
+                return "Objects not found"
+
+            pairs = [(object1_name, object2_name)]
+
+            if mode == 'LODS':
+                stem1, lod1 = split_lod(object1_name)
+                stem2, lod2 = split_lod(object2_name)
+                if lod1 is None or lod2 is None:
+                    return "Both objects need a LOD suffix (_0, _1, ...) to replace all LODs"
+
+                lods = sorted({split_lod(object.name)[1] for object in scope_objects()} - {None})
+                pairs = [(f"{stem1}_{lod}", f"{stem2}_{lod}") for lod in lods]
+                pairs = [(name1, name2) for name1, name2 in pairs if name1 in objects and name2 in objects]
+
+        used = [name for pair in pairs for name in pair]
+        if len(used) != len(set(used)):
+            return "An object would be replaced twice, or replaced and used as replacement"
+
+        return [(objects[name1], objects[name2]) for name1, name2 in pairs]
+
+    def plan_parenting(self, pairs) -> list:
+        replacements = dict(pairs)
+        replaced = set(replacements.values())
+
+        def resolve(parent: bpy.types.Object | None) -> bpy.types.Object | None:
+            # A parent that gets replaced itself hands its children to its replacement
+            return replacements.get(parent, parent)
+
+        plan = []
+        for object1, object2 in pairs:
+            # Reparent children of object2 to their previous parent to leave object2 free
+            for child in object2.children:
+                if child is object1 or child in replaced:
+                    continue
+                plan.append((child, resolve(object2.parent)))
+
+            # Give object2 the same parent as object1
+            plan.append((object2, resolve(object1.parent)))
+
+            # Reparent all children of object1 to object2
+            for child in object1.children:
+                if child is object2 or child in replacements:
+                    continue
+                plan.append((child, object2))
+
+        return plan
+        
+def plan_body_parents(index: SceneIndex) -> list:
+    """ Pair every body part, extra piece and root in the index with its parent, triangulating meshes on the way """
+    objects = body_objects(index)
+
+    with phase("triangulate", len(objects)):
+        triangulate_meshes(objects)
+
+    return parent_pairs(index, objects)
+
+def plan_tag_parents(index: SceneIndex) -> list:
+    """ Set the g2 properties of every object, then pair every tag in the index with its parent """
+    sync_g2_properties(index.all())
+
+    return parent_pairs(index, tag_objects(index))
+
+def plan_cap_parents(index: SceneIndex) -> list:
+    """ Pair every cap in the index with its own body part, triangulating it on the way """
+    caps = cap_objects(index)
+
+    with phase("triangulate", len(caps)):
+        triangulate_meshes(caps)
+
+    return parent_pairs(index, caps)
+
+def body_objects(index: SceneIndex) -> list:
+    """ Body parts, extra pieces and roots that get a parent, scene_root and tags left out """
+    objects = []
+
+    for object in index.role(ROLE_PART) + index.role(ROLE_ROOT):
+        try:
+            if object.g2_prop_tag or object.name == "scene_root":
                 continue
-            reparent_preserve_world(child, old_parent2)
+            objects.append(object)
+        except ReferenceError:
+            continue
 
-        # Give object2 the same parent as object1
-        object2.parent = old_parent1
-        object2.matrix_parent_inverse = object1.matrix_parent_inverse.copy()
+    return objects
 
-        # Reparent all children of object1 to object2
-        for child in list(object1.children):
-            if child is object2:
+def tag_objects(index: SceneIndex) -> list:
+    """ Tags that get a parent, their g2 properties have to be set first """
+    tags = []
+
+    for object in index.role(ROLE_TAG):
+        try:
+            # startswith * added as failsafe if tag object didn't get g2 props set
+            if not object.g2_prop_tag or not object.name.startswith("*"):
                 continue
-            reparent_preserve_world(child, object2)
+            tags.append(object)
+        except ReferenceError:
+            continue
 
-        print(f"Copied parenting from {object1.name} to {object2.name}")
-        
-def triangulate(object: bpy.types.Object) -> None:
-    check_object_isinstance(object)
-    
-    mesh = object.data
+    return tags
 
-    # Check for non-triangulated faces
-    if any(len(face.vertices) > 3 for face in mesh.polygons):
-        object.modifiers.new(name="Triangulate", type='TRIANGULATE')
-        object.modifiers['Triangulate'].quad_method = 'BEAUTY'
-        object.modifiers['Triangulate'].ngon_method = 'BEAUTY'
-        object.modifiers['Triangulate'].min_vertices = 4  # Minimum vertices for ngons
+def cap_objects(index: SceneIndex) -> list:
+    """ Mesh caps that get a parent """
+    caps = []
 
-        # Apply the modifier
-        bpy.context.view_layer.objects.active = object
-        bpy.ops.object.modifier_apply(modifier="Triangulate") 
+    for object in index.role(ROLE_CAP):
+        try:
+            if object.g2_prop_tag or object.type != 'MESH':
+                continue
+            caps.append(object)
+        except ReferenceError:
+            continue
 
-def set_parent(child: bpy.types.Object, parent: bpy.types.Object) -> None:
-    try:
-        # Copy the world matrix
-        matrixcopy = child.matrix_world.copy()
-        
-        # Set the parent
-        child.parent = parent
-        
-        # Restore the world transform
-        child.matrix_world = matrixcopy
-        
-        print(f"{child.name} parented to {parent.name}")
-        
-    except Exception as e:
-        print(f"[ISSUE] Exception {e} caught. Research it, fix the issue, try again.")     
+    return caps
+
+def parent_pairs(index: SceneIndex, objects) -> list:
+    """ (object, parent) of every object whose name asks for a parent, parent is None when it doesn't exist """
+    pairs = []
+
+    for object in objects:
+        try:
+            info = index.info(object)
+            if info is None or info.parent is None:
+                continue
+            pairs.append((object, index.get_parent(object)))
+        except ReferenceError:
+            continue
+        except Exception as e:
+            print(f"[ISSUE] Exception {e} caught. Research it, fix the issue, try again.")
+
+    return pairs
+
+def incremental_index(operator: bpy.types.Operator, context: bpy.types.Context, key: str) -> SceneIndex:
+    """ A SceneIndex limited to what changed since the last run of key, when the incremental mode is on """
+    index = SceneIndex.from_context(context)
+
+    if context.scene.settings.incremental and not operator.force_full:
+        previous = load_fingerprints(context.scene, key)
+        if previous is not None:
+            with phase("fingerprints", len(index)):
+                index.limit_to(changed_objects(index.objects.values(), previous))
+
+    return index
+
+def report_parenting(operator: bpy.types.Operator, result: ParentingResult) -> None:
+    message = f"{result.parented} object(s) parented, {result.unchanged} already in place."
+    if result.missing:
+        operator.report({'WARNING'}, f"{message} No parent found for {result.missing} object(s).")
+    else:
+        operator.report({'INFO'}, message)
 
 def check_object_isinstance(object: bpy.types.Object) -> bool:
     if not isinstance(object, bpy.types.Object):
         raise TypeError(f"{object.name} must be an Object.")
     return True
 
-def set_g2_properties(self, object: bpy.types.Object) -> None:
-    object.g2_prop_name = object.name[:-2]
-    object.g2_prop_shader = "" # Used for MD3 as far as I know
-                
-    if "_off" in object.name[:-2]:
-        object.g2_prop_off = True
-        object.g2_prop_tag = False
-        
-    elif object.name.startswith("*"):
-        object.g2_prop_tag = True
-        
-    else:
-        object.g2_prop_off = False
-        object.g2_prop_tag = False
-
 classes = [
     OBJECT_OT_ReplaceObject,
     OBJECT_OT_AllParent,
@@ -991,13 +1052,16 @@ classes = [
     OBJECT_OT_UnparentAll,
     SetG2Properties,
     OBJECT_OT_CreateTags,
+    OBJECT_OT_CreateLODs,
     OBJECT_OT_Clean,
     OBJECT_OT_CreateSkinFile,
     OBJECT_OT_SelectObjectType,
     OBJECT_OT_SetArmature,
     OBJECT_OT_RemoveEmptyVertexGroups,
+    OBJECT_OT_LimitBoneWeights,
     OBJECT_OT_CreateRoot,
     OBJECT_OT_OrigintoGeometry,
+    OBJECT_OT_Validate,
 ]
 
 def register_operators():
@@ -1,5 +1,10 @@
 import bpy
 
+from . import g2_sync, profiling, runner, validation
+
+# Problems and g2 changes listed in the panel, the rest only goes to the console
+MAX_PROBLEM_LINES = 12
+
 class OBJECT_PT_SkeletonTool(bpy.types.Panel):
     """ Creates a Panel in the Object properties window """
     bl_label = "Jedi Academy: Skeleton tool"
@@ -22,36 +27,75 @@ class OBJECT_PT_SkeletonTool(bpy.types.Panel):
                 box = layout.box()
                 draw_content(box)
 
-        draw_box("Parenting", "show_parenting", lambda box: [
-            box.operator("parent.all"),
-            box.operator("parent.objects"),
-            box.operator("parent.tags"),
-            box.operator("parent.caps"),
+        # Operators running in chunks, see runner.py
+        for line in runner.status.values():
+            layout.label(text=line, icon="TIME")
+
+        # Scope of every operator, see scope.py
+        layout.prop(settings, "scope")
+        if settings.scope == 'COLLECTION':
+            layout.prop(settings, "scope_collection")
+        elif settings.scope == 'SUBTREE':
+            layout.prop(settings, "scope_root")
+
+        def draw_parenting(box):
+            box.operator("parent.all")
+            box.prop(settings, "incremental")
+            if settings.incremental:
+                box.operator("parent.all", text="Parent All (full)").force_full = True
+            box.prop(settings, "lod_filter")
+            box.operator("parent.objects")
+            box.operator("parent.tags")
+            box.operator("parent.caps")
             box.operator("remove.parent")
-        ])
 
-        draw_box("Replace", "show_replace", lambda box: [
-            box.prop(settings, "object1"),
-            box.prop(settings, "object2"),
-            box.prop(settings, "action"),
+        draw_box("Parenting", "show_parenting", draw_parenting)
+
+        def draw_replace(box):
+            box.prop(settings, "replace_mode")
+            if settings.replace_mode == 'PATTERN':
+                box.prop(settings, "replace_from")
+                box.prop(settings, "replace_to")
+            else:
+                box.prop(settings, "object1")
+                box.prop(settings, "object2")
+            box.prop(settings, "action")
             box.operator("object.replace_object", icon="ARROW_LEFTRIGHT")
-        ])
+
+        draw_box("Replace", "show_replace", draw_replace)
 
         draw_box("Create", "show_create", lambda box: [
+            box.prop(settings, "tags_file"),
             box.operator("create.tags"),
             box.operator("create.root"),
+            box.operator("create.lods"),
+            box.prop(settings, "lod_count"),
+            box.prop(settings, "lod_ratio"),
             box.operator("create.skinfile")
         ])
 
-        draw_box("Set", "show_set", lambda box: [
-            box.operator("set.armaturemod"),
-            box.operator("set.g2properties"),
+        def draw_set(box):
+            box.operator("set.armaturemod")
+            box.operator("set.g2properties")
+            box.operator("set.g2properties", text="Preview G2 Properties").dry_run = True
+            changes = g2_sync.last_changes
+            if changes:
+                col = box.column(align=True)
+                col.label(text=f"{len(changes)} g2 propert(ies) changed or to change", icon="INFO")
+                for change in changes[:MAX_PROBLEM_LINES]:
+                    col.label(text=f"    {change.object}: {change.property} -> {change.new!r}")
             box.operator("origin.geometry")
-        ])
+            box.prop(settings, "origin_center")
+
+        draw_box("Set", "show_set", draw_set)
 
         draw_box("Cleanup", "show_cleanup", lambda box: [
             box.operator("remove.emptyvgroups"),
-            box.operator("clean.hierarchy")
+            box.operator("limit.boneweights"),
+            box.prop(settings, "weight_limit"),
+            box.prop(settings, "weight_threshold"),
+            box.operator("clean.hierarchy"),
+            box.prop(settings, "purge_orphans")
         ])
 
         draw_box("Select", "show_select", lambda box: [
@@ -61,6 +105,36 @@ class OBJECT_PT_SkeletonTool(bpy.types.Panel):
             box.prop(settings, "tags")
         ])
 
+        def draw_validate(box):
+            box.operator("validate.model", icon="CHECKMARK")
+            problems = validation.last_problems
+            if not problems:
+                return
+            col = box.column(align=True)
+            for check, count in validation.summary(problems).items():
+                col.label(text=f"{check}: {count}", icon="ERROR")
+            for problem in problems[:MAX_PROBLEM_LINES]:
+                col.label(text=f"    {problem.object}: {problem.message}")
+            if len(problems) > MAX_PROBLEM_LINES:
+                col.label(text=f"    ... {len(problems) - MAX_PROBLEM_LINES} more in the console")
+
+        draw_box("Validate", "show_validate", draw_validate)
+
+        def draw_profiling(box):
+            box.prop(settings, "profile")
+            if not settings.profile:
+                return
+            box.prop(settings, "profile_output")
+            if settings.profile_output != 'NONE':
+                box.prop(settings, "profile_dir")
+            for profiler in profiling.last_results.values():
+                col = box.column(align=True)
+                col.label(text=f"{profiler.operator}: {profiler.seconds * 1000:.1f} ms", icon="TIME")
+                for phase in sorted(profiler.phases.values(), key=lambda phase: phase.seconds, reverse=True):
+                    col.label(text=f"    {phase.name}: {phase.seconds * 1000:.1f} ms, {phase.objects} object(s)")
+
+        draw_box("Profiling", "show_profiling", draw_profiling)
+
 def register_panels():
     bpy.utils.register_class(OBJECT_PT_SkeletonTool)
 
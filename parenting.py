@@ -0,0 +1,81 @@
+import bpy
+from mathutils import Matrix
+from typing import NamedTuple
+
+from .profiling import phase
+
+
+class ParentingResult(NamedTuple):
+    parented: int   # children that got a new parent
+    unchanged: int  # children that already had the right parent
+    missing: int    # children for which no parent was found
+
+
+def apply_parenting(pairs, update: bool = True, unparent: bool = False) -> ParentingResult:
+    """
+    Parent many objects at once while keeping every world transform intact.
+
+    pairs is an iterable of (child, parent) tuples, parent may be None when no parent was found.
+    With unparent=True a None parent means the child is unparented instead.
+    Every world matrix is read before anything is written, so nothing has to be re-evaluated
+    in between. Parents are applied before their children, and the view layer is updated
+    once at the end (skip that with update=False when more batches follow).
+    """
+    plan = {}
+    missing = 0
+
+    for child, parent in pairs:
+        try:
+            if parent is None and not unparent:
+                missing += 1
+                continue
+            if child == parent:
+                continue
+            plan[child.name] = (child, parent)
+        except ReferenceError:
+            continue
+
+    # Capture every world matrix up front, nothing below reads a matrix that was already written
+    world_matrices = {}
+    for child, parent in plan.values():
+        for object in (child, parent):
+            if object is not None and object.name not in world_matrices:
+                world_matrices[object.name] = object.matrix_world.copy()
+
+    parented = 0
+    unchanged = 0
+
+    with phase("parent") as parenting:
+        for child, parent in sorted(plan.values(), key=lambda pair: hierarchy_depth(pair[0], plan)):
+            if child.parent == parent:
+                unchanged += 1
+                continue
+
+            child.parent = parent
+            if parent is None:
+                child.matrix_parent_inverse = Matrix.Identity(4)
+            else:
+                child.matrix_parent_inverse = world_matrices[parent.name].inverted_safe()
+            child.matrix_basis = world_matrices[child.name]
+            parented += 1
+        parenting.objects = parented
+
+    if update and parented:
+        with phase("depsgraph update"):
+            bpy.context.view_layer.update()
+
+    return ParentingResult(parented, unchanged, missing)
+
+
+def hierarchy_depth(object: bpy.types.Object, plan: dict) -> int:
+    """ Depth of an object in the planned hierarchy, planned parents win over current ones """
+    depth = 0
+    seen = {object.name}
+
+    while True:
+        planned = plan.get(object.name)
+        object = planned[1] if planned else object.parent
+        if object is None or object.name in seen:
+            return depth
+        seen.add(object.name)
+        depth += 1
@@ -0,0 +1,223 @@
+"""
+Hierarchy and Ghoul2 property planning without Blender.
+
+plan_names() takes a list of object names and returns, for every name, what the operators would
+do with it: its role, LOD, side, the parent it gets (only when that parent is in the list too)
+and its Ghoul2 properties. Nothing in here imports bpy, so the naming rules can be tested and
+benchmarked with plain CPython, and many name lists can be planned in parallel.
+
+Name lists are JSON files with a list of names (batch_cli.py --export-names writes them) or text
+files with one name per line. From a shell, with this folder as working directory:
+    python planning.py names/*.json --jobs 8 --output plans/
+    python planning.py names/model.json --by-lod
+    python planning.py --bench 4x2000
+
+Every LOD's hierarchy only depends on its own objects (and scene_root), so plan_lods() plans the
+LODs separately, in parallel when asked, and a single LOD can be planned again on its own.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+from typing import NamedTuple
+
+try:
+    from .naming import g2_properties, parse_name, split_lod, ROLE_STUPIDTRIANGLE
+except ImportError:
+    # Running as a plain script
+    from naming import g2_properties, parse_name, split_lod, ROLE_STUPIDTRIANGLE
+
+
+class ObjectPlan(NamedTuple):
+    name: str
+    role: str
+    base: str
+    lod: int | None
+    side: str | None
+    parent: str | None      # None when the object stays unparented
+    delete: bool            # stupidtriangles are removed
+    g2_name: str
+    g2_shader: str
+    g2_off: bool | None     # None leaves g2_prop_off as it is
+    g2_tag: bool
+
+
+def plan_names(names) -> dict[str, ObjectPlan]:
+    """ The full parent and property plan of a list of object names """
+    names = list(names)
+    existing = set(names)
+    plan = {}
+
+    for name in names:
+        info = parse_name(name)
+        properties = g2_properties(name)
+        parent = info.parent if info.parent in existing else None
+
+        plan[name] = ObjectPlan(
+            name, info.role, info.base, info.lod, info.side, parent,
+            info.role == ROLE_STUPIDTRIANGLE,
+            properties.name, properties.shader, properties.off, properties.tag,
+        )
+
+    return plan
+
+
+def group_by_lod(names) -> dict[int | None, list[str]]:
+    """ Names per LOD, names without a LOD suffix (scene_root, skeleton_root, ...) go under None """
+    groups = {}
+    for name in names:
+        groups.setdefault(split_lod(name)[1], []).append(name)
+    return groups
+
+
+def plan_lod(names, lod: int) -> dict[str, ObjectPlan]:
+    """ Plan a single LOD of a name list, the other LODs are not looked at """
+    suffix = f"_{lod}"
+    return _plan_group([name for name in names if name.endswith(suffix)])
+
+
+def _plan_group(names: list[str]) -> dict[str, ObjectPlan]:
+    # scene_root is only there so model_root_N finds its parent
+    plan = plan_names(names + ["scene_root"])
+    if "scene_root" not in names:
+        del plan["scene_root"]
+    return plan
+
+
+def plan_lods(names, jobs: int | None = 1) -> dict[int | None, dict[str, ObjectPlan]]:
+    """ Plan every LOD on its own, in worker processes when jobs is not 1 """
+    groups = group_by_lod(names)
+    lods = sorted(lod for lod in groups if lod is not None)
+
+    if jobs == 1 or len(lods) < 2:
+        plans = [_plan_group(groups[lod]) for lod in lods]
+    else:
+        with Pool(processes=jobs) as pool:
+            plans = pool.map(_plan_group, [groups[lod] for lod in lods])
+
+    result = dict(zip(lods, plans))
+    if None in groups:
+        result[None] = plan_names(groups[None])
+    return result
+
+
+def hierarchy_order(plan: dict[str, ObjectPlan]) -> list[str]:
+    """ Names ordered parents before children """
+    depths = {}
+
+    def depth(name: str) -> int:
+        if name not in depths:
+            depths[name] = 0  # guards against loops
+            parent = plan[name].parent
+            depths[name] = depth(parent) + 1 if parent else 0
+        return depths[name]
+
+    return sorted(plan, key=depth)
+
+
+def load_names(file_path: str) -> list[str]:
+    with open(file_path) as f:
+        if file_path.endswith(".json"):
+            data = json.load(f)
+            return data["objects"] if isinstance(data, dict) else data
+        return [line.strip() for line in f if line.strip()]
+
+
+def plan_file(file_path: str) -> tuple[str, dict, float]:
+    """ Plan one name list file, returns (file path, plan as plain dicts, seconds) """
+    started = time.perf_counter()
+    plan = plan_names(load_names(file_path))
+    return file_path, {name: entry._asdict() for name, entry in plan.items()}, time.perf_counter() - started
+
+
+def plan_files(file_paths, jobs: int | None = None) -> dict[str, dict]:
+    """ Plan many name list files in parallel, one process per CPU unless jobs says otherwise """
+    file_paths = list(file_paths)
+    if jobs == 1 or len(file_paths) < 2:
+        results = map(plan_file, file_paths)
+        return {file_path: plan for file_path, plan, _ in results}
+
+    with Pool(processes=jobs) as pool:
+        return {file_path: plan for file_path, plan, _ in pool.imap_unordered(plan_file, file_paths)}
+
+
+def synthetic_names(lods: int, parts: int) -> list[str]:
+    """ A name list the size of a big kitbash scene, for benchmarking """
+    core = ("hips", "torso", "head", "l_arm", "r_arm", "l_hand", "r_hand", "l_leg", "r_leg")
+    names = ["scene_root", "skeleton_root"]
+
+    for lod in range(lods):
+        names.append(f"model_root_{lod}")
+        names += [f"{base}_{lod}" for base in core]
+        names += [f"{core[i % len(core)]}_piece{i}_{lod}" for i in range(parts)]
+        names += [f"{base}_cap_torso_off_{lod}" for base in core]
+        names += [f"*{base}_tag_{lod}" for base in core]
+        names.append(f"stupidtriangle_off_{lod}")
+
+    return names
+
+
+def bench(lods: int, parts: int, repeat: int = 5) -> float:
+    names = synthetic_names(lods, parts)
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        hierarchy_order(plan_names(names))
+        runs.append(time.perf_counter() - started)
+
+    best = min(runs)
+    print(f"{len(names)} names planned in {best * 1000:.2f} ms ({len(names) / best:,.0f} names/s, best of {repeat})")
+    return best
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Plan the Skeleton Tool hierarchy of exported name lists.")
+    parser.add_argument("files", nargs="*", help="name lists (.json or .txt)")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes, one per CPU by default")
+    parser.add_argument("--output", help="folder for the <name>.plan.json files, printed otherwise")
+    parser.add_argument("--by-lod", action="store_true", help="plan every LOD separately, keyed by LOD in the output")
+    parser.add_argument("--lod", type=int, help="only plan this LOD")
+    parser.add_argument("--bench", metavar="LODSxPARTS", help="time plan_names on a synthetic name list")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        lods, _, parts = args.bench.partition("x")
+        bench(int(lods), int(parts))
+        return 0
+
+    if not args.files:
+        parser.print_usage()
+        return 1
+
+    started = time.perf_counter()
+    if args.by_lod or args.lod is not None:
+        plans = {}
+        for file_path in args.files:
+            names = load_names(file_path)
+            if args.lod is not None:
+                lod_plans = {args.lod: plan_lod(names, args.lod)}
+            else:
+                lod_plans = plan_lods(names, args.jobs)
+            plans[file_path] = {str(lod): {name: entry._asdict() for name, entry in plan.items()} for lod, plan in lod_plans.items()}
+    else:
+        plans = plan_files(args.files, args.jobs)
+
+    for file_path, plan in plans.items():
+        if args.output:
+            os.makedirs(args.output, exist_ok=True)
+            out_path = os.path.join(args.output, os.path.splitext(os.path.basename(file_path))[0] + ".plan.json")
+            with open(out_path, "w") as f:
+                json.dump(plan, f, indent=4)
+        else:
+            json.dump({file_path: plan}, sys.stdout, indent=4)
+            print()
+
+    print(f"{len(plans)} name list(s) planned in {time.perf_counter() - started:.3f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
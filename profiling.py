@@ -0,0 +1,141 @@
+"""
+Opt-in timing of the Skeleton Tool operators.
+
+Operators wrap their execute() with @profiled. When profiling is enabled in the settings, the
+wrapper times the whole call and every phase() block inside it (wall time and number of objects
+processed), reports a summary, keeps it for the panel and can dump it to disk as JSON or as
+cProfile stats. When profiling is disabled phase() does nothing but yield.
+"""
+
+import cProfile
+import functools
+import json
+import os
+import time
+from contextlib import contextmanager
+
+
+class Phase:
+    def __init__(self, name: str, objects: int = 0):
+        self.name = name
+        self.objects = objects
+        self.seconds = 0.0
+
+    def as_dict(self) -> dict:
+        return {"name": self.name, "seconds": self.seconds, "objects": self.objects}
+
+
+class Profiler:
+    """
+    Collects the phases of a single operator call.
+
+    ---------
+    Methods:
+    ---------
+    phase(self, name, objects=0)
+        Context manager timing a block. The yielded Phase's objects can be set inside the block
+        once the number of processed objects is known. Phases with the same name add up.
+
+    summary(self)
+        One line per phase, slowest first.
+    """
+
+    def __init__(self, operator: str, enabled: bool = True):
+        self.operator = operator
+        self.enabled = enabled
+        self.phases: dict[str, Phase] = {}
+        self.seconds = 0.0
+
+    @contextmanager
+    def phase(self, name: str, objects: int = 0):
+        phase = Phase(name, objects)
+        if not self.enabled:
+            yield phase
+            return
+
+        started = time.perf_counter()
+        try:
+            yield phase
+        finally:
+            phase.seconds = time.perf_counter() - started
+            total = self.phases.setdefault(name, Phase(name))
+            total.seconds += phase.seconds
+            total.objects += phase.objects
+
+    def summary(self) -> str:
+        phases = sorted(self.phases.values(), key=lambda phase: phase.seconds, reverse=True)
+        parts = [f"{phase.name} {phase.seconds * 1000:.1f} ms ({phase.objects})" for phase in phases]
+        return f"{self.operator}: {self.seconds * 1000:.1f} ms" + (f" - {', '.join(parts)}" if parts else "")
+
+    def as_dict(self) -> dict:
+        return {
+            "operator": self.operator,
+            "seconds": self.seconds,
+            "phases": [phase.as_dict() for phase in self.phases.values()],
+        }
+
+
+_disabled = Profiler("", enabled=False)
+_current = _disabled
+
+# Most recent profile of every operator, shown in the panel
+last_results: dict[str, Profiler] = {}
+
+
+def current() -> Profiler:
+    return _current
+
+
+def phase(name: str, objects: int = 0):
+    """ Time a block with the profiler of the operator that is running, if any """
+    return _current.phase(name, objects)
+
+
+def profiled(execute):
+    """ Decorator for Operator.execute, see the module docstring """
+
+    @functools.wraps(execute)
+    def wrapper(self, context):
+        global _current
+        settings = getattr(context.scene, "settings", None)
+
+        # Nested operator calls are timed as part of the outer one
+        if settings is None or not settings.profile or _current.enabled:
+            return execute(self, context)
+
+        profiler = Profiler(self.bl_idname)
+        stats = cProfile.Profile() if settings.profile_output == 'CPROFILE' else None
+        started = time.perf_counter()
+        _current = profiler
+        try:
+            if stats:
+                stats.enable()
+            return execute(self, context)
+        finally:
+            if stats:
+                stats.disable()
+            _current = _disabled
+            profiler.seconds = time.perf_counter() - started
+            last_results[profiler.operator] = profiler
+            self.report({'INFO'}, profiler.summary())
+            dump(profiler, settings, stats)
+
+    return wrapper
+
+
+def dump(profiler: Profiler, settings, stats: cProfile.Profile | None = None) -> str | None:
+    if settings.profile_output == 'NONE':
+        return None
+
+    import bpy
+    directory = bpy.path.abspath(settings.profile_dir) or bpy.app.tempdir
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, f"{profiler.operator.replace('.', '_')}_{time.strftime('%Y%m%d_%H%M%S')}")
+
+    if stats:
+        stats.dump_stats(base + ".prof")
+        return base + ".prof"
+
+    with open(base + ".json", "w") as f:
+        json.dump(profiler.as_dict(), f, indent=4)
+    return base + ".json"
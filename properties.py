@@ -1,6 +1,8 @@
 import bpy
 from bpy.props import *
 
+from .name_search import search
+
 class AddonProperties(bpy.types.PropertyGroup): 
     meshes : bpy.props.BoolProperty(name="Meshes",default=False)
     caps : bpy.props.BoolProperty(name="Caps",default=False)
@@ -13,11 +15,37 @@ class AddonProperties(bpy.types.PropertyGroup):
         subtype = "DIR_PATH"
     )
     
+    tags_file: bpy.props.StringProperty(
+        name = "Tag set",
+        default = "",
+        description = "Tag file (.json or .g2tags) used by Create Tags, leave empty for the bundled tags.json",
+        maxlen = 1024,
+        subtype = "FILE_PATH"
+    )
+    
     shadername: bpy.props.StringProperty(name="Enter .skin name", default= "default")
     modelname: bpy.props.StringProperty(name="Enter model name", default="")
+    skin_variants: bpy.props.StringProperty(
+        name="Skin variants",
+        default="",
+        description="Comma separated variants to write in one go, name or name=texture suffix (e.g. default, red=_red, blue=_blue). Empty writes the .skin name only"
+    )
     
-    object1: bpy.props.StringProperty(name="Replace", search=lambda self, context, edit_text: [o.name for o in bpy.data.objects if edit_text.lower() in o.name.lower()])
-    object2: bpy.props.StringProperty(name="With", search=lambda self, context, edit_text: [o.name for o in bpy.data.objects if edit_text.lower() in o.name.lower()])
+    # Ranked against the other picker's object, see name_search.py
+    object1: bpy.props.StringProperty(name="Replace", search=lambda self, context, edit_text: search(edit_text, self.object2))
+    object2: bpy.props.StringProperty(name="With", search=lambda self, context, edit_text: search(edit_text, self.object1))
+    replace_mode: bpy.props.EnumProperty(
+    name="Replace",
+    description="Which objects to replace",
+    items=[
+        ('SINGLE', "Single", "Replace object 1 with object 2"),
+        ('LODS', "All LODs", "Replace every LOD of object 1 with the same LOD of object 2"),
+        ('PATTERN', "Pattern", "Replace every object whose name contains a text with the object named after replacing that text"),
+    ],
+    default='SINGLE',
+    )
+    replace_from: bpy.props.StringProperty(name="Names with", default="", description="Objects whose name contains this text get replaced")
+    replace_to: bpy.props.StringProperty(name="Replace by", default="", description="The replacement is the object named with this text instead")
     action: bpy.props.EnumProperty(
     name="After Replace",
     description="What to do with the old object after replacing",
@@ -28,6 +56,98 @@ class AddonProperties(bpy.types.PropertyGroup):
     ],
     default='DELETE',
     )
+    scope: bpy.props.EnumProperty(
+        name="Scope",
+        description="Which objects the operators work on",
+        items=[
+            ('SCENE', "Scene", "Every object of the active scene"),
+            ('COLLECTION', "Collection", "Every object of a collection and its child collections"),
+            ('SUBTREE', "Root", "A scene_root or model_root_N, everything below it and the unparented objects next to it"),
+            ('FILE', "Whole file", "Every object in the file, other scenes included"),
+        ],
+        default='SCENE',
+    )
+    scope_collection: bpy.props.PointerProperty(name="Collection", type=bpy.types.Collection)
+    scope_root: bpy.props.StringProperty(
+        name="Root",
+        description="scene_root or model_root_N to work under",
+        search=lambda self, context, edit_text: [o.name for o in bpy.data.objects if ("scene_root" in o.name or "model_root" in o.name) and edit_text.lower() in o.name.lower()]
+    )
+    lod_filter: bpy.props.IntProperty(
+        name="LOD",
+        default=-1,
+        min=-1,
+        description="Only process this LOD (the _N suffix), -1 processes every LOD"
+    )
+    lod_count: bpy.props.IntProperty(
+        name="LODs",
+        default=3,
+        min=1,
+        max=9,
+        description="Create LODs creates model_root_1 up to this one"
+    )
+    lod_ratio: bpy.props.FloatProperty(
+        name="Triangle ratio",
+        default=0.5,
+        min=0.05,
+        max=0.95,
+        description="Triangle budget of every LOD compared to the one before it, LOD N keeps ratio ^ N of the LOD 0 triangles"
+    )
+    weight_limit: bpy.props.IntProperty(
+        name="Weights per vertex",
+        default=4,
+        min=1,
+        max=8,
+        description="Limit Bone Weights keeps this many of the strongest weights of every vertex"
+    )
+    weight_threshold: bpy.props.FloatProperty(
+        name="Prune below",
+        default=0.01,
+        min=0.0,
+        max=0.5,
+        description="Limit Bone Weights removes weights below this, after normalizing"
+    )
+    origin_center: bpy.props.EnumProperty(
+        name="Origin center",
+        description="Where Set Origin to Geometry puts the origin",
+        items=[
+            ('BOUNDS', "Bounds", "Center of the bounding box"),
+            ('MEDIAN', "Median", "Average of all vertices"),
+        ],
+        default='BOUNDS',
+    )
+    incremental: bpy.props.BoolProperty(
+        name="Only changed objects",
+        default=False,
+        description="Parent All and Set G2 Properties only process objects that were added, renamed or changed since their last run"
+    )
+    purge_orphans: bpy.props.BoolProperty(
+        name="Purge orphan data",
+        default=False,
+        description="Also remove the meshes and materials that were only used by deleted objects"
+    )
+    profile: bpy.props.BoolProperty(
+        name="Profile operators",
+        default=False,
+        description="Time every Skeleton Tool operator and its phases"
+    )
+    profile_output: bpy.props.EnumProperty(
+        name="Dump",
+        description="Where to write the timings of every profiled run",
+        items=[
+            ('NONE', "Nothing", "Only report the timings"),
+            ('JSON', "JSON", "Write the phase timings to a .json file"),
+            ('CPROFILE', "cProfile", "Write cProfile stats to a .prof file"),
+        ],
+        default='NONE',
+    )
+    profile_dir: bpy.props.StringProperty(
+        name = "Dump to",
+        default = "",
+        description = "Folder for the profiling dumps, the temporary folder when empty",
+        maxlen = 1024,
+        subtype = "DIR_PATH"
+    )
     
    # Collapsible toggles
     show_parenting : BoolProperty(default=True)
@@ -36,6 +156,8 @@ class AddonProperties(bpy.types.PropertyGroup):
     show_set : BoolProperty(default=True)
     show_cleanup : BoolProperty(default=True)
     show_select : BoolProperty(default=True)
+    show_validate : BoolProperty(default=True)
+    show_profiling : BoolProperty(default=False)
 
 def register_properties():
     bpy.utils.register_class(AddonProperties)
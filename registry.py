@@ -0,0 +1,249 @@
+"""
+Live registry of the Skeleton Tool objects.
+
+Every object is classified once (naming.parse_name, plus the g2_prop_tag rule of SceneIndex)
+and kept, by session_uid, grouped by role, LOD and side. The registry is built
+when a file is loaded and then kept up to date from depsgraph_update_post: only the objects
+the depsgraph reports as updated are classified again, and objects that disappeared are
+dropped when the object count changes.
+
+classify() compares the name and g2_prop_tag an entry was made with and re-parses on a
+mismatch, so a rename the depsgraph didn't report is picked up the first time the object is
+classified again. Parsing cost follows the number of changes, not the size of the scene.
+
+SceneIndex (so parenting and validation) classifies through it, Select Object Type reads the
+groups, and the Replace pickers follow the log of added and removed names (changes_since()).
+"""
+
+import bpy
+from bpy.app.handlers import persistent
+from collections import defaultdict
+from typing import NamedTuple
+
+from .naming import NameInfo, parse_name, ROLE_TAG
+
+# Most changes kept in the log, see Registry.changes_since()
+MAX_LOG = 10000
+
+
+class Entry(NamedTuple):
+    object: bpy.types.Object
+    name: str           # name the entry was classified with
+    tag: bool           # g2_prop_tag the entry was classified with
+    info: NameInfo
+
+
+def classify_name(name: str, tag: bool) -> NameInfo:
+    info = parse_name(name)
+
+    # Objects flagged as tag by their g2 properties are tags, whatever their name says
+    if info.role != ROLE_TAG and tag:
+        info = info._replace(role=ROLE_TAG, parent=None)
+    return info
+
+
+class Registry:
+    """
+    Classified objects, grouped for cheap lookups.
+
+    ---------
+    Methods:
+    ---------
+    classify(self, object)
+        Returns the NameInfo of an object, from the registry when its name and g2_prop_tag
+        didn't change, parsed (and stored) otherwise.
+
+    update(self, objects)
+        Classifies these objects again if they changed.
+
+    sync(self)
+        Adds objects the registry missed and drops deleted ones, when the object count says so.
+
+    group(self, role=None, lod=None, side=None)
+        Returns the registered objects matching every given key, in no particular order.
+
+    info(self, name)
+        Returns the NameInfo of an object name, from the registry when possible.
+
+    changes_since(self, generation)
+        Returns the (removed name, added name) changes after a generation, None when they
+        are no longer logged.
+
+    generation is bumped on every change, caches built on top of the registry compare it.
+    """
+
+    def __init__(self, objects=()):
+        self.entries: dict[int, Entry] = {}
+        self.by_name: dict[str, int] = {}
+        self.by_role: dict[str, set[int]] = defaultdict(set)
+        self.by_lod: dict[int | None, set[int]] = defaultdict(set)
+        self.by_side: dict[str | None, set[int]] = defaultdict(set)
+        self.generation = 0
+
+        # (removed name, added name) of every change after generation log_start
+        self.log: list[tuple[str | None, str | None]] = []
+        self.log_start = 0
+
+        self.update(objects)
+        self.log.clear()
+        self.log_start = self.generation
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def classify(self, object: bpy.types.Object) -> NameInfo:
+        uid = object.session_uid
+        name = object.name
+        tag = bool(getattr(object, "g2_prop_tag", False))
+
+        entry = self.entries.get(uid)
+        if entry is not None and entry.name == name and entry.tag == tag:
+            if entry.object is not object:
+                # Same object behind a new wrapper (after an undo, ...), the old one may be stale
+                self.entries[uid] = entry._replace(object=object)
+            return entry.info
+
+        if entry is not None:
+            self._remove(uid)
+
+        entry = Entry(object, name, tag, classify_name(name, tag))
+        self.entries[uid] = entry
+        self.by_name[name] = uid
+        self.by_role[entry.info.role].add(uid)
+        self.by_lod[entry.info.lod].add(uid)
+        self.by_side[entry.info.side].add(uid)
+        self.changed(None, name)
+        return entry.info
+
+    def update(self, objects) -> None:
+        for object in objects:
+            try:
+                self.classify(object)
+            except ReferenceError:
+                continue
+
+    def sync(self) -> None:
+        if len(self.entries) == len(bpy.data.objects):
+            return
+
+        uids = {}
+        for object in bpy.data.objects:
+            uids[object.session_uid] = object
+
+        for uid in [uid for uid in self.entries if uid not in uids]:
+            self._remove(uid)
+        self.update(object for uid, object in uids.items() if uid not in self.entries)
+
+    def group(self, role: str | None = None, lod: int | None = None, side: str | None = None) -> list[bpy.types.Object]:
+        sets = []
+        if role is not None:
+            sets.append(self.by_role.get(role, set()))
+        if lod is not None:
+            sets.append(self.by_lod.get(lod, set()))
+        if side is not None:
+            sets.append(self.by_side.get(side, set()))
+
+        uids = set.intersection(*sets) if sets else set(self.entries)
+        return [
+            object for object, info in self._current(uids)
+            if (role is None or info.role == role) and (lod is None or info.lod == lod) and (side is None or info.side == side)
+        ]
+
+    def info(self, name: str) -> NameInfo:
+        uid = self.by_name.get(name)
+        if uid is not None:
+            entry = self.entries[uid]
+            try:
+                if entry.object.name == name:
+                    return self.classify(entry.object)
+            except ReferenceError:
+                self._remove(uid)
+        return classify_name(name, False)
+
+    def changes_since(self, generation: int) -> list[tuple[str | None, str | None]] | None:
+        if generation < self.log_start:
+            return None
+        return self.log[generation - self.log_start:]
+
+    def _current(self, uids) -> list[tuple[bpy.types.Object, NameInfo]]:
+        """ (object, info) of these entries, stale ones classified again, deleted ones dropped """
+        current = []
+        for uid in uids:
+            entry = self.entries.get(uid)
+            if entry is None:
+                continue
+            try:
+                current.append((entry.object, self.classify(entry.object)))
+            except ReferenceError:
+                self._remove(uid)
+        return current
+
+    def _remove(self, uid: int) -> None:
+        entry = self.entries.pop(uid, None)
+        if entry is None:
+            return
+
+        if self.by_name.get(entry.name) == uid:
+            del self.by_name[entry.name]
+        self.by_role[entry.info.role].discard(uid)
+        self.by_lod[entry.info.lod].discard(uid)
+        self.by_side[entry.info.side].discard(uid)
+        self.changed(entry.name, None)
+
+    def changed(self, removed: str | None, added: str | None) -> None:
+        self.generation += 1
+        self.log.append((removed, added))
+
+        # Readers that fell this far behind rebuild from the entries
+        if len(self.log) > MAX_LOG:
+            drop = len(self.log) - MAX_LOG // 2
+            del self.log[:drop]
+            self.log_start += drop
+
+
+_registry: Registry | None = None
+
+
+def registry() -> Registry:
+    """ The registry of the open file, built on first use """
+    global _registry
+    if _registry is None:
+        _registry = Registry(bpy.data.objects)
+    else:
+        _registry.sync()
+    return _registry
+
+
+@persistent
+def on_depsgraph_update(scene, depsgraph) -> None:
+    if _registry is None or not depsgraph.id_type_updated('OBJECT'):
+        return
+
+    for update in depsgraph.updates:
+        datablock = update.id
+        if isinstance(datablock, bpy.types.Object):
+            try:
+                _registry.classify(datablock.original)
+            except ReferenceError:
+                continue
+    _registry.sync()
+
+
+@persistent
+def on_load(*args) -> None:
+    global _registry
+    _registry = Registry(bpy.data.objects)
+
+
+def register_registry():
+    bpy.app.handlers.depsgraph_update_post.append(on_depsgraph_update)
+    bpy.app.handlers.load_post.append(on_load)
+
+
+def unregister_registry():
+    global _registry
+    if on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(on_depsgraph_update)
+    if on_load in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(on_load)
+    _registry = None
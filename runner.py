@@ -0,0 +1,200 @@
+"""
+Chunked, cancellable operator runs.
+
+An operator that mixes in ChunkedOperator writes its work as a generator, run(context), that
+yields (done, total) every few objects and returns what execute() would return plus the report:
+({'FINISHED'} or {'CANCELLED'}, report type, message).
+
+Blender only guarantees a context for the call it was passed to, so every yield gets the
+context of the current call sent back (context = yield done, total) and the run must carry on
+with that one. Parts of a run that don't need the context can be generators of their own, run
+with yield from stage(...).
+
+    - execute() (scripts, the batch CLI, blender -b) runs the generator to the end right away
+    - invoke() (a click in the panel) runs it from a timer in time-boxed chunks, so the UI
+      stays responsive: window_manager.progress shows how far it got, the panel shows a
+      status line, and ESC cancels it. The work done up to then is kept, the generator gets
+      closed and the view layer updated. An undo or redo while it runs frees the objects the
+      generator holds, the run is cancelled the same way at the next tick.
+
+Background Blender and profiled runs always go through execute(), the profiler needs to see
+the whole run in one piece.
+"""
+
+import time
+
+import bpy
+from bpy.app.handlers import persistent
+
+from .profiling import profiled
+
+# Time a timer tick may spend on the work before giving the UI back
+CHUNK_SECONDS = 0.05
+TIMER_INTERVAL = 0.01
+
+# Objects between two yields of a generator, see chunks()
+CHUNK_SIZE = 25
+
+# bl_label -> status line of every chunked operator that is running, shown in the panel
+status: dict[str, str] = {}
+
+# Undos and redos so far, a run that sees it change was undone under its feet
+undo_count = 0
+
+
+def chunks(items, size: int = CHUNK_SIZE):
+    """ Split a list into lists of at most size items, yields (items before the chunk, chunk) """
+    for start in range(0, len(items), size):
+        yield start, items[start:start + size]
+
+
+def complete(steps, value=None):
+    """ Run a generator to the end, sending value into every yield, returns what it returns """
+    try:
+        next(steps)
+        while True:
+            steps.send(value)
+    except StopIteration as stop:
+        return stop.value
+
+
+def stage(steps, before: int = 0, total: int | None = None):
+    """
+    Run steps, a generator of (done, its own total) that doesn't need the context, as a stage
+    of a run: yields (before + done, total or its own total) and returns (what steps returned,
+    the context sent into the last yield).
+    """
+    done = steps_total = 0
+    try:
+        while True:
+            try:
+                done, steps_total = next(steps)
+            except StopIteration as stop:
+                # One more yield, the run carries on with the context of that call
+                context = yield before + done, total if total is not None else steps_total
+                return stop.value, context
+            yield before + done, total if total is not None else steps_total
+    finally:
+        steps.close()
+
+
+def redraw_panels(context: bpy.types.Context) -> None:
+    screen = getattr(context, "screen", None)
+    if screen is None:
+        return
+    for area in screen.areas:
+        if area.type == 'VIEW_3D':
+            area.tag_redraw()
+
+
+class ChunkedOperator:
+    """
+    Mixin for operators whose work can be split in chunks, see the module docstring.
+
+    ---------
+    Methods:
+    ---------
+    run(self, context)
+        Generator doing the work, every operator using the mixin defines it. Yields
+        (done, total) now and then, gets the current context sent back, and returns
+        (result, report type, message).
+    """
+
+    @profiled
+    def execute(self, context):
+        return self.finish(complete(self.run(context), context))
+
+    def invoke(self, context, event):
+        settings = context.scene.settings
+        if bpy.app.background or context.window is None or settings.profile:
+            return self.execute(context)
+
+        # A second run would work on the same objects as the one still going
+        if self.bl_label in status:
+            self.report({'WARNING'}, f"{self.bl_label} is already running, wait for it or press ESC.")
+            return {'CANCELLED'}
+
+        # The generator is started from the first timer tick, with the context of that call
+        self._work = None
+        self._undo_count = undo_count
+        self._done, self._total = 0, 0
+        self._timer = context.window_manager.event_timer_add(TIMER_INTERVAL, window=context.window)
+        context.window_manager.modal_handler_add(self)
+        context.window_manager.progress_begin(0, 1)
+        self.set_status(context)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if self._undo_count != undo_count:
+            return self.cancel_run(context, 'ERROR', f"{self.bl_label} cancelled after {self._done} of {self._total}, the scene was undone.")
+
+        if event.type == 'ESC':
+            return self.cancel_run(context, 'WARNING', f"{self.bl_label} cancelled after {self._done} of {self._total}.")
+
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        deadline = time.perf_counter() + CHUNK_SECONDS
+        try:
+            if self._work is None:
+                self._work = self.run(context)
+                self._done, self._total = next(self._work)
+            while time.perf_counter() < deadline:
+                self._done, self._total = self._work.send(context)
+        except StopIteration as stop:
+            self.stop(context)
+            return self.finish(stop.value)
+        except Exception as e:
+            print(f"[ISSUE] Exception {e} caught in {self.bl_idname}.")
+            return self.cancel_run(context, 'ERROR', f"{self.bl_label} failed: {e}")
+
+        if self._total:
+            context.window_manager.progress_update(self._done / self._total)
+        self.set_status(context)
+        return {'RUNNING_MODAL'}
+
+    def set_status(self, context) -> None:
+        if self._total:
+            status[self.bl_label] = f"{self.bl_label}: {self._done}/{self._total} ({self._done / self._total:.0%}), ESC to cancel"
+        else:
+            status[self.bl_label] = f"{self.bl_label}: starting, ESC to cancel"
+        redraw_panels(context)
+
+    def cancel_run(self, context, level: str, message: str) -> set[str]:
+        """ Close the generator, keep the work done so far and evaluate it """
+        if self._work is not None:
+            self._work.close()
+        self.stop(context)
+        context.view_layer.update()
+        self.report({level}, message)
+        return {'CANCELLED'}
+
+    def stop(self, context) -> None:
+        context.window_manager.event_timer_remove(self._timer)
+        context.window_manager.progress_end()
+        status.pop(self.bl_label, None)
+        redraw_panels(context)
+
+    def finish(self, result) -> set[str]:
+        outcome, level, message = result
+        if message:
+            self.report({level}, message)
+        return outcome
+
+
+@persistent
+def on_undo(*args) -> None:
+    global undo_count
+    undo_count += 1
+
+
+def register_runner():
+    bpy.app.handlers.undo_post.append(on_undo)
+    bpy.app.handlers.redo_post.append(on_undo)
+
+
+def unregister_runner():
+    if on_undo in bpy.app.handlers.undo_post:
+        bpy.app.handlers.undo_post.remove(on_undo)
+    if on_undo in bpy.app.handlers.redo_post:
+        bpy.app.handlers.redo_post.remove(on_undo)
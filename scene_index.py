@@ -0,0 +1,113 @@
+import bpy
+from collections import defaultdict
+
+from .profiling import phase
+from .registry import registry
+from .scope import scope_members
+from .naming import NameInfo
+
+
+class SceneIndex:
+    """
+    A single pass over the scene that classifies every object once (role, body part, LOD, side
+    and the name of its parent), so operators don't have to walk all objects and parse
+    names over and over again. The classification comes from the live registry (registry.py),
+    only objects whose name or g2_prop_tag changed since it last saw them are parsed again.
+
+    ---------
+    Methods:
+    ---------
+    get(self, name)
+        Returns the object with that name or None, without going through bpy.data.objects.
+
+    info(self, object)
+        Returns the NameInfo of an object (or object name).
+
+    get_parent(self, object)
+        Returns the object an object should be parented to, or None. Parents outside the index
+        (scene_root under a Root or Collection scope, ...) are looked up in bpy.data.objects.
+
+    role(self, role)
+        Returns every indexed object with the given role, in scope order.
+
+    all(self)
+        Returns every indexed object, in scope order.
+
+    limit_to(self, names)
+        Makes role() and all() only return these objects and the objects that should be
+        parented to them. Lookups with get() and get_parent() still see the whole index.
+
+    An index can be built for a single LOD, objects of other LODs are skipped. scene_root is
+    always kept, it is the parent of every model_root_N.
+    """
+
+    def __init__(self, members: dict[int, bpy.types.Object], lod: int | None = None):
+        self.objects: dict[str, bpy.types.Object] = {}
+        self.infos: dict[str, NameInfo] = {}
+        self.by_role: dict[str, list[bpy.types.Object]] = defaultdict(list)
+        self.limit: set[str] | None = None
+        classify = registry().classify
+
+        for object in members.values():
+            try:
+                # Renames no handler saw yet (bpy.ops calls in a row in a script) are caught here
+                info = classify(object)
+            except ReferenceError:
+                continue
+
+            if lod is not None and info.lod != lod and info.name != "scene_root":
+                continue
+
+            self.objects[info.name] = object
+            self.infos[info.name] = info
+            self.by_role[info.role].append(object)
+
+    @classmethod
+    def from_context(cls, context: bpy.types.Context) -> "SceneIndex":
+        """ Index of the chosen scope (see scope.py), of a single LOD when the LOD setting is 0 or higher """
+        lod = context.scene.settings.lod_filter
+        objects = scope_members(context)
+        with phase("index") as indexing:
+            index = cls(objects, lod if lod >= 0 else None)
+            indexing.objects = len(index)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.objects)
+
+    def get(self, name: str | None) -> bpy.types.Object | None:
+        if name is None:
+            return None
+        return self.objects.get(name)
+
+    def info(self, object: bpy.types.Object | str) -> NameInfo | None:
+        name = object if isinstance(object, str) else object.name
+        return self.infos.get(name)
+
+    def get_parent(self, object: bpy.types.Object | str) -> bpy.types.Object | None:
+        info = self.info(object)
+        if info is None or info.parent is None:
+            return None
+        return self.get(info.parent) or bpy.data.objects.get(info.parent)
+
+    def role(self, role: str) -> list[bpy.types.Object]:
+        objects = self.by_role.get(role, [])
+        if self.limit is None:
+            return objects
+        return [object for object in objects if self.key(object) in self.limit]
+
+    def all(self) -> list[bpy.types.Object]:
+        if self.limit is None:
+            return list(self.objects.values())
+        return [object for name, object in self.objects.items() if name in self.limit]
+
+    def limit_to(self, names) -> None:
+        names = set(names)
+        names |= {name for name, info in self.infos.items() if info.parent in names}
+        self.limit = names
+
+    def key(self, object: bpy.types.Object) -> str | None:
+        try:
+            return object.name
+        except ReferenceError:
+            return None
@@ -0,0 +1,149 @@
+"""
+The set of objects the operators work on.
+
+A .blend often holds several characters, other scenes and linked reference rigs. Instead of
+walking bpy.data.objects, every operator asks scope_objects() for the objects of the chosen
+scope:
+    - SCENE:        the objects of the active scene
+    - COLLECTION:   the objects of a collection and its child collections
+    - SUBTREE:      scene_root or a model_root_N and everything below it, plus the unparented
+                    objects next to it (same collection, same LOD) that still have to be
+                    parented into it
+    - FILE:         every object in the file, as the operators used to do
+
+Linked (library) objects are never part of a scope, they can't be edited anyway.
+
+The resolved list is cached and shared by every operator run after another (Parent All, the
+batch CLI step chain, ...) until objects are added, removed or renamed, the scope changes, or an
+undo/redo swaps the data. Scripts and blender -b can delete and add objects without any
+depsgraph update in between, so the cache is also thrown away as soon as one of its objects
+was freed, or the file has more objects than when it was resolved.
+"""
+
+import bpy
+from bpy.app.handlers import persistent
+
+from .naming import split_lod
+from .profiling import phase
+
+# (cache key, object count of the file, session_uid -> object) of the last resolved scope
+_cache: tuple[tuple, int, dict[int, bpy.types.Object]] | None = None
+
+
+def scope_key(context: bpy.types.Context) -> tuple:
+    settings = context.scene.settings
+    collection = settings.scope_collection
+    return (
+        context.scene.session_uid,
+        settings.scope,
+        collection.session_uid if collection else None,
+        settings.scope_root,
+    )
+
+
+def resolve_scope(context: bpy.types.Context) -> list[bpy.types.Object]:
+    """ The objects of the scope chosen in the settings, without the cache """
+    settings = context.scene.settings
+    scope = settings.scope
+
+    if scope == 'FILE':
+        objects = bpy.data.objects
+    elif scope == 'COLLECTION':
+        collection = settings.scope_collection
+        objects = collection.all_objects if collection else []
+    elif scope == 'SUBTREE':
+        objects = subtree_objects(bpy.data.objects.get(settings.scope_root))
+    else:
+        objects = context.scene.objects
+
+    return [object for object in objects if object.library is None]
+
+
+def subtree_objects(root: bpy.types.Object | None) -> list[bpy.types.Object]:
+    """ root, its descendants and the unparented objects of its collections that belong to its LOD """
+    if root is None:
+        return []
+
+    objects = [root] + list(root.children_recursive)
+    members = set(objects)
+    _, lod = split_lod(root.name)
+
+    for collection in root.users_collection:
+        for object in collection.all_objects:
+            if object.parent is not None or object in members:
+                continue
+            if lod is not None and split_lod(object.name)[1] != lod:
+                continue
+            objects.append(object)
+            members.add(object)
+
+    return objects
+
+
+def scope_objects(context: bpy.types.Context | None = None) -> list[bpy.types.Object]:
+    """ The objects of the chosen scope, resolved once and shared until something changes """
+    return list(scope_members(context).values())
+
+
+def scope_members(context: bpy.types.Context | None = None) -> dict[int, bpy.types.Object]:
+    """ session_uid -> object of the chosen scope, in scope order. Don't change the dict, it is the cache. """
+    global _cache
+    context = context or bpy.context
+    key = scope_key(context)
+
+    if _cache is not None and _cache[0] == key and _cache[1] == len(bpy.data.objects):
+        try:
+            for object in _cache[2].values():
+                object.name
+            return _cache[2]
+        except ReferenceError:
+            # Freed since it was resolved, whatever replaced it may belong to the scope
+            pass
+
+    with phase("scope") as resolving:
+        members = {object.session_uid: object for object in resolve_scope(context)}
+        _cache = (key, len(bpy.data.objects), members)
+        resolving.objects = len(members)
+    return members
+
+
+def invalidate() -> None:
+    global _cache
+    _cache = None
+
+
+@persistent
+def on_depsgraph_update(scene, depsgraph) -> None:
+    # Renames, reparenting and collection changes can all move objects in or out of a scope
+    if _cache is not None and (depsgraph.id_type_updated('OBJECT') or depsgraph.id_type_updated('COLLECTION')):
+        invalidate()
+
+
+@persistent
+def on_load(*args) -> None:
+    invalidate()
+
+
+@persistent
+def on_undo(*args) -> None:
+    # Undo and redo load the data again, every cached object is a different one afterwards
+    invalidate()
+
+
+def register_scope():
+    bpy.app.handlers.depsgraph_update_post.append(on_depsgraph_update)
+    bpy.app.handlers.load_post.append(on_load)
+    bpy.app.handlers.undo_post.append(on_undo)
+    bpy.app.handlers.redo_post.append(on_undo)
+
+
+def unregister_scope():
+    if on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(on_depsgraph_update)
+    if on_load in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(on_load)
+    if on_undo in bpy.app.handlers.undo_post:
+        bpy.app.handlers.undo_post.remove(on_undo)
+    if on_undo in bpy.app.handlers.redo_post:
+        bpy.app.handlers.redo_post.remove(on_undo)
+    invalidate()
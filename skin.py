@@ -0,0 +1,97 @@
+"""
+.skin export.
+
+A .skin file maps every surface (g2_prop_name) of LOD 0 to the texture it should use, one
+"surface,texture" line each. Several variants (model_default.skin, model_red.skin, ...) can be
+written in one pass: every object is looked at once, its texture is resolved once per material,
+and the line is streamed to every variant file right away. Texture paths come from the
+session-wide cache in texture_cache.py.
+"""
+
+import bpy
+import os
+import re
+from contextlib import ExitStack
+
+from .profiling import phase
+from .texture_cache import material_texture
+
+CAPS_TEXTURE = "models/players/stormtrooper/caps.tga"
+ROOTS = ("skeleton_root", "model_root", "scene_root")
+
+
+def parse_variants(text: str, default: str) -> list[tuple[str, str]]:
+    """
+    Turn "default, red=_red, blue=_blue" into [("default", ""), ("red", "_red"), ("blue", "_blue")].
+    The suffix is appended to every texture name of that variant. An empty text gives the default skin only.
+    """
+    variants = []
+    for entry in text.split(","):
+        name, _, suffix = entry.strip().partition("=")
+        if name.strip():
+            variants.append((name.strip(), suffix.strip()))
+    return variants or [(default, "")]
+
+
+def skin_objects(objects):
+    """ The LOD 0 meshes that belong in a .skin file: no roots, no tags """
+    for object in objects:
+        try:
+            if object.type != "MESH":
+                continue
+
+            if object.g2_prop_tag:
+                continue
+
+            if not object.name.endswith("_0"):
+                continue
+
+            if any(root in object.name for root in ROOTS):
+                continue
+
+            yield object
+        except ReferenceError:
+            continue
+
+
+def texture_name(material: bpy.types.Material | None) -> str | None:
+    """ Bare texture name (no folder, extension or .001) of a material """
+    texture = material_texture(material)
+    if not texture:
+        return None
+
+    texture = re.sub(r'\.\d+$', '', texture)
+    texture = os.path.basename(texture)
+    return os.path.splitext(texture)[0]
+
+
+def write_skins(objects, folder: str, modelname: str, variants: list[tuple[str, str]]) -> list[str]:
+    """ Write model_<variant>.skin for every variant in a single pass over objects, returns the written paths """
+    paths = [os.path.join(folder, f"model_{name}.skin") for name, _ in variants]
+    textures = {}
+    caps = []
+
+    with ExitStack() as stack, phase("write skins") as writing:
+        files = [stack.enter_context(open(path, "w")) for path in paths]
+
+        for object in skin_objects(objects):
+            if object.g2_prop_off and "_cap_" in object.name:
+                caps.append(f"{object.g2_prop_name},{CAPS_TEXTURE}\n")
+                continue
+
+            material = getattr(object, "active_material", None)
+            key = material.as_pointer() if material else None
+            if key not in textures:
+                textures[key] = texture_name(material)
+            texture = textures[key]
+
+            for file, (_, suffix) in zip(files, variants):
+                materialname = f"{texture}{suffix}" if texture else None
+                file.write(f"{object.g2_prop_name},models/players/{modelname}/{materialname}.tga\n")
+            writing.objects += 1
+
+        # Caps go last, the same in every variant
+        for file in files:
+            file.writelines(caps)
+
+    return paths
@@ -0,0 +1,256 @@
+"""
+Tag templates (the *hip_bl, *head_eyes, ... triangles) used by create.tags.
+
+Two file formats can be read:
+    - .json     the legacy tags.json layout, parsed in full on first use
+    - .g2tags   a compact binary layout: a small JSON header followed by flat float32/int32
+                arrays. Only the header is read when the file is opened, the arrays are
+                memory-mapped and a tag is only turned into a template when asked for by name.
+
+Opened files are kept in memory at module level and only read again when the file on disk
+changes (checked by mtime). Templates are ready for the mesh builder: vertices and faces are
+sequences that can go straight into from_pydata, and vertex weights are grouped per weight
+value so they only need a handful of vertex_group.add() calls.
+
+A legacy file can be converted from the command line, without Blender:
+    python tag_templates.py tags.json humanoid.g2tags
+"""
+
+import json
+import os
+import struct
+import sys
+from abc import ABC, abstractmethod
+from typing import NamedTuple
+
+import numpy as np
+
+BINARY_MAGIC = b"G2TAGS\x00\x01"
+BINARY_EXTENSION = ".g2tags"
+ALIGNMENT = 16
+
+
+class TagTemplate(NamedTuple):
+    name: str
+    vertices: tuple | np.ndarray   # ((x, y, z), ...), a (vertices, 3) float32 array from .g2tags files
+    faces: tuple           # ((v1, v2, v3), ...)
+    vertex_groups: dict    # group name -> ((weight, (vertex indices)), ...)
+
+
+class TagLibrary(ABC):
+    """
+    A set of tag templates that can be looked up by name. Every file format defines names() and load().
+
+    ---------
+    Methods:
+    ---------
+    names(self)
+        Names of every tag in the file, in file order.
+
+    get(self, name)
+        The TagTemplate of a single tag, or None. Templates are built once and then reused.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.templates: dict[str, TagTemplate] = {}
+
+    @abstractmethod
+    def names(self) -> list[str]:
+        ...
+
+    def get(self, name: str) -> TagTemplate | None:
+        template = self.templates.get(name)
+        if template is None and name in self.names():
+            template = self.templates[name] = self.load(name)
+        return template
+
+    @abstractmethod
+    def load(self, name: str) -> TagTemplate:
+        ...
+
+    def __len__(self) -> int:
+        return len(self.names())
+
+    def __iter__(self):
+        for name in self.names():
+            yield self.get(name)
+
+
+class JsonTagLibrary(TagLibrary):
+    """ Legacy tags.json, every vertex a nested list and every weight a dict """
+
+    def __init__(self, file_path: str):
+        super().__init__(file_path)
+        with open(file_path, 'r') as f:
+            self.mesh_data = {mesh_data['name']: mesh_data for mesh_data in json.load(f)}
+        self.order = list(self.mesh_data)
+
+    def names(self) -> list[str]:
+        return self.order
+
+    def load(self, name: str) -> TagTemplate:
+        return parse_template(self.mesh_data[name])
+
+
+class BinaryTagLibrary(TagLibrary):
+    """ Compact .g2tags file, see write_binary() for the layout """
+
+    def __init__(self, file_path: str):
+        super().__init__(file_path)
+        with open(file_path, 'rb') as f:
+            if f.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+                raise ValueError(f"{file_path} is not a {BINARY_EXTENSION} file.")
+            header_size, = struct.unpack("<I", f.read(4))
+            self.header = json.loads(f.read(header_size).decode("utf-8"))
+
+        self.data = np.memmap(file_path, dtype=np.uint8, mode='r', offset=self.header['data_offset'])
+        self.order = list(self.header['tags'])
+
+    def names(self) -> list[str]:
+        return self.order
+
+    def array(self, entry: list, dtype) -> np.ndarray:
+        offset, count = entry
+        return np.frombuffer(self.data, dtype=dtype, count=count, offset=offset)
+
+    def load(self, name: str) -> TagTemplate:
+        tag = self.header['tags'][name]
+
+        vertices = self.array(tag['vertices'], np.float32).reshape(-1, 3)
+        loops = self.array(tag['loops'], np.int32)
+        face_sizes = self.array(tag['face_sizes'], np.int32)
+        starts = np.concatenate(([0], np.cumsum(face_sizes)[:-1]))
+        faces = tuple(tuple(loops[start:start + size].tolist()) for start, size in zip(starts, face_sizes))
+
+        vertex_groups = {}
+        for group_name, entries in tag['vertex_groups'].items():
+            indices = self.array(entries['indices'], np.int32)
+            weights = self.array(entries['weights'], np.float32)
+            vertex_groups[group_name] = tuple(
+                (float(weight), tuple(indices[weights == weight].tolist())) for weight in np.unique(weights)
+            )
+
+        return TagTemplate(name, vertices, faces, vertex_groups)
+
+
+# path -> (mtime, library)
+_cache: dict[str, tuple[float, TagLibrary]] = {}
+
+
+def default_tags_path() -> str:
+    return os.path.join(os.path.dirname(os.path.realpath(__file__)), "tags.json")
+
+
+def is_binary(file_path: str) -> bool:
+    with open(file_path, 'rb') as f:
+        return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+def open_tag_library(file_path: str | None = None) -> TagLibrary:
+    """ The tag library of a file, from memory unless the file changed since the last call """
+    file_path = file_path or default_tags_path()
+    mtime = os.path.getmtime(file_path)
+
+    cached = _cache.get(file_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    library = BinaryTagLibrary(file_path) if is_binary(file_path) else JsonTagLibrary(file_path)
+    _cache[file_path] = (mtime, library)
+    return library
+
+
+def load_tag_templates(file_path: str | None = None) -> list[TagTemplate]:
+    """ Every template of a tag file, in file order """
+    return list(open_tag_library(file_path))
+
+
+def clear_cache() -> None:
+    _cache.clear()
+
+
+def parse_template(mesh_data: dict) -> TagTemplate:
+    vertices = tuple(tuple(vertex) for vertex in mesh_data['vertices'])
+    faces = tuple(tuple(face) for face in mesh_data['faces'])
+
+    vertex_groups = {}
+    for group_name, vertices_weights in mesh_data.get('vertex_groups', {}).items():
+        by_weight = {}
+        for vw in vertices_weights:
+            by_weight.setdefault(vw['weight'], []).append(vw['vertex_index'])
+        vertex_groups[group_name] = tuple((weight, tuple(indices)) for weight, indices in by_weight.items())
+
+    return TagTemplate(mesh_data['name'], vertices, faces, vertex_groups)
+
+
+def write_binary(templates, file_path: str) -> None:
+    """
+    Write templates to a .g2tags file.
+
+    Layout: magic, uint32 header size, JSON header, then the data section. The header lists
+    for every tag the (byte offset, element count) of its arrays inside the data section:
+    float32 vertices (x, y, z), int32 loops with int32 face sizes, and per vertex group int32
+    vertex indices with float32 weights. Every array starts on a 16 byte boundary.
+    """
+    chunks = []
+    size = 0
+
+    def add(array: np.ndarray) -> list:
+        nonlocal size
+        padding = -size % ALIGNMENT
+        if padding:
+            chunks.append(b"\x00" * padding)
+            size += padding
+        offset = size
+        chunks.append(array.tobytes())
+        size += array.nbytes
+        return [offset, int(array.size)]
+
+    tags = {}
+    for template in templates:
+        vertex_groups = {}
+        for group_name, weights in template.vertex_groups.items():
+            indices = [index for weight, group_indices in weights for index in group_indices]
+            values = [weight for weight, group_indices in weights for index in group_indices]
+            vertex_groups[group_name] = {
+                'indices': add(np.asarray(indices, dtype=np.int32)),
+                'weights': add(np.asarray(values, dtype=np.float32)),
+            }
+
+        tags[template.name] = {
+            'vertices': add(np.asarray(template.vertices, dtype=np.float32).reshape(-1)),
+            'loops': add(np.asarray([index for face in template.faces for index in face], dtype=np.int32)),
+            'face_sizes': add(np.asarray([len(face) for face in template.faces], dtype=np.int32)),
+            'vertex_groups': vertex_groups,
+        }
+
+    # The data section starts right after the header, aligned like every array in it
+    prefix_size = len(BINARY_MAGIC) + 4
+    header = {'version': 1, 'data_offset': 0, 'tags': tags}
+    header_size = len(json.dumps(header, separators=(",", ":"))) + 16
+    header['data_offset'] = prefix_size + header_size + (-(prefix_size + header_size) % ALIGNMENT)
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    header_bytes = header_bytes.ljust(header['data_offset'] - prefix_size, b" ")
+
+    with open(file_path, 'wb') as f:
+        f.write(BINARY_MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        for chunk in chunks:
+            f.write(chunk)
+
+
+def convert_json_to_binary(json_path: str, binary_path: str | None = None) -> str:
+    """ Convert a legacy tags.json to .g2tags, next to it unless another path is given """
+    binary_path = binary_path or os.path.splitext(json_path)[0] + BINARY_EXTENSION
+    write_binary(JsonTagLibrary(json_path), binary_path)
+    return binary_path
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python tag_templates.py <tags.json> [output.g2tags]")
+        sys.exit(1)
+
+    print(f"Written {convert_json_to_binary(*sys.argv[1:])}")
@@ -0,0 +1,84 @@
+"""
+Material -> texture path cache shared by everything that needs to know a material's texture.
+
+Resolving walks a material's node tree for its first image texture. The result is kept per
+material (by session_uid) for the whole session, and dropped again by a depsgraph handler as
+soon as the material, its node tree or any image changes. Loading another file clears it all.
+"""
+
+import bpy
+from bpy.app.handlers import persistent
+
+# material session_uid -> texture path (or None when the material has no image texture)
+_textures: dict[int, str | None] = {}
+
+
+def resolve_texture(material: bpy.types.Material) -> str | None:
+    """ Path of the first image texture in a material's node tree, relative to base/ when possible """
+    node_tree = getattr(material, "node_tree", None)
+    if not node_tree:
+        return None
+
+    image_node = next((node for node in node_tree.nodes if getattr(node, "type", "") == "TEX_IMAGE"), None)
+    image = getattr(image_node, "image", None)
+    filepath = getattr(image, "filepath", None)
+    if not filepath:
+        return None
+
+    texture = filepath.replace("\\", "/")
+    if "base/" in texture:
+        return texture.split("base/", 1)[1]
+
+    return texture
+
+
+def material_texture(material: bpy.types.Material | None) -> str | None:
+    """ Cached resolve_texture(), every material is only resolved once until it changes """
+    if not material:
+        return None
+
+    key = material.session_uid
+    if key not in _textures:
+        _textures[key] = resolve_texture(material)
+    return _textures[key]
+
+
+def invalidate(material: bpy.types.Material | None = None) -> None:
+    """ Forget one material, or everything when no material is given """
+    if material is None:
+        _textures.clear()
+    else:
+        _textures.pop(material.session_uid, None)
+
+
+@persistent
+def on_depsgraph_update(scene, depsgraph) -> None:
+    if not _textures:
+        return
+
+    for update in depsgraph.updates:
+        datablock = update.id
+        if isinstance(datablock, bpy.types.Material):
+            _textures.pop(datablock.session_uid, None)
+        elif isinstance(datablock, (bpy.types.Image, bpy.types.NodeTree)):
+            # Can't tell cheaply which materials use it
+            _textures.clear()
+            return
+
+
+@persistent
+def on_load(*args) -> None:
+    _textures.clear()
+
+
+def register_texture_cache():
+    bpy.app.handlers.depsgraph_update_post.append(on_depsgraph_update)
+    bpy.app.handlers.load_post.append(on_load)
+
+
+def unregister_texture_cache():
+    if on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(on_depsgraph_update)
+    if on_load in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(on_load)
+    _textures.clear()
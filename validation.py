@@ -0,0 +1,205 @@
+"""
+Ghoul2 model validation.
+
+validate() walks a SceneIndex once and checks every object against the same naming rules the
+parenting operators and Set G2 Properties use (naming.py), plus the limits the engine enforces
+when it loads a .glm. Mesh statistics come from foreach_get arrays and the flat weight arrays of
+vertex_groups.py, and are computed once per mesh even when several objects share it.
+
+The problems of the last run are kept in last_problems for the panel.
+"""
+
+import bpy
+import numpy as np
+from collections import Counter
+from typing import NamedTuple
+
+from .meshops import polygon_sizes
+from .naming import g2_properties, NameInfo, ROLE_ROOT, ROLE_STUPIDTRIANGLE
+from .profiling import phase
+from .scene_index import SceneIndex
+from .vertex_groups import weight_arrays
+
+# Engine limits (JKA renderer and the GLM format)
+MAX_BONE_WEIGHTS = 4        # weights per vertex
+MAX_BONE_REFS = 28          # bones referenced by a single surface
+MAX_VERTICES = 1000         # vertices per surface
+MAX_TRIANGLES = 2000        # triangles per surface
+
+ERROR = 'ERROR'
+WARNING = 'WARNING'
+
+# Checks, in the order the panel lists them
+CHECK_G2_NAME = "g2 name"
+CHECK_PARENT = "parent"
+CHECK_NGONS = "n-gons"
+CHECK_WEIGHTS = "bone weights"
+CHECK_BONES = "bones"
+CHECK_SIZE = "surface size"
+CHECK_LODS = "lods"
+CHECKS = (CHECK_G2_NAME, CHECK_PARENT, CHECK_NGONS, CHECK_WEIGHTS, CHECK_BONES, CHECK_SIZE, CHECK_LODS)
+
+
+class Problem(NamedTuple):
+    severity: str       # ERROR or WARNING
+    check: str
+    object: str
+    message: str
+
+
+class MeshStats(NamedTuple):
+    vertices: int
+    triangles: int
+    ngons: int
+
+
+class WeightStats(NamedTuple):
+    max_weights: int    # most weights on a single vertex
+    over_limit: int     # vertices with more than MAX_BONE_WEIGHTS weights
+    bones: int          # deform groups that are actually used
+
+
+# Problems of the last validate() run
+last_problems: list[Problem] = []
+
+
+def mesh_stats(mesh: bpy.types.Mesh) -> MeshStats:
+    sizes = polygon_sizes(mesh)
+    return MeshStats(len(mesh.vertices), int((sizes - 2).sum()) if len(sizes) else 0, int((sizes > 3).sum()))
+
+
+def weight_stats(object: bpy.types.Object, bones: set[str] | None) -> WeightStats:
+    """ Weights per vertex and used bones of a mesh object, only groups named after a bone count when bones is given """
+    vertices, groups, weights = weight_arrays(object)
+
+    used = weights > 0
+    if bones is not None:
+        names = np.array([group.name in bones for group in object.vertex_groups] + [False], dtype=bool)
+        # Stale memberships point past the last group, they map to the trailing False
+        used &= names[np.minimum(groups, len(names) - 1)]
+
+    if not used.any():
+        return WeightStats(0, 0, 0)
+
+    per_vertex = np.bincount(vertices[used])
+    return WeightStats(int(per_vertex.max()), int((per_vertex > MAX_BONE_WEIGHTS).sum()), len(np.unique(groups[used])))
+
+
+def validate(index: SceneIndex, armature: bpy.types.Object | None = None) -> list[Problem]:
+    """ Every problem found in the indexed objects, errors first """
+    problems = []
+    bones = {bone.name for bone in armature.data.bones} if armature and armature.type == 'ARMATURE' else None
+    meshes: dict[int, MeshStats] = {}
+    surfaces: dict[int | None, set[str]] = {}
+
+    with phase("validate") as checking:
+        for object in index.all():
+            try:
+                name = object.name
+                info = index.info(name)
+                if info is None or info.role == ROLE_STUPIDTRIANGLE:
+                    continue
+
+                problems += check_parent(index, object, info)
+
+                if object.type != 'MESH' or info.role == ROLE_ROOT:
+                    continue
+
+                problems += check_g2_name(object)
+                surfaces.setdefault(info.lod, set()).add(object.g2_prop_name or name)
+
+                key = object.data.as_pointer()
+                if key not in meshes:
+                    meshes[key] = mesh_stats(object.data)
+                problems += check_mesh(name, meshes[key])
+
+                if object.vertex_groups:
+                    problems += check_weights(name, weight_stats(object, bones))
+                checking.objects += 1
+            except ReferenceError:
+                continue
+
+        problems += check_lods(surfaces)
+
+    problems.sort(key=lambda problem: (problem.severity != ERROR, CHECKS.index(problem.check), problem.object))
+    last_problems[:] = problems
+    return problems
+
+
+def check_g2_name(object: bpy.types.Object) -> list[Problem]:
+    expected = g2_properties(object.name)
+
+    if not object.g2_prop_name:
+        return [Problem(ERROR, CHECK_G2_NAME, object.name, "g2_prop_name is empty")]
+
+    if object.g2_prop_name != expected.name:
+        return [Problem(WARNING, CHECK_G2_NAME, object.name, f"g2_prop_name is \"{object.g2_prop_name}\", naming rules say \"{expected.name}\"")]
+
+    if expected.tag and not object.g2_prop_tag:
+        return [Problem(ERROR, CHECK_G2_NAME, object.name, "tag without g2_prop_tag")]
+
+    return []
+
+
+def check_parent(index: SceneIndex, object: bpy.types.Object, info: NameInfo) -> list[Problem]:
+    if info.parent is None:
+        return []
+
+    if object.parent is None:
+        if index.get_parent(object) is None:
+            return [Problem(ERROR, CHECK_PARENT, object.name, f"unparented, {info.parent} does not exist")]
+        return [Problem(ERROR, CHECK_PARENT, object.name, f"unparented, should be under {info.parent}")]
+
+    if object.parent.name != info.parent:
+        return [Problem(WARNING, CHECK_PARENT, object.name, f"parented to {object.parent.name}, naming rules say {info.parent}")]
+
+    return []
+
+
+def check_mesh(name: str, stats: MeshStats) -> list[Problem]:
+    problems = []
+
+    if stats.ngons:
+        problems.append(Problem(ERROR, CHECK_NGONS, name, f"{stats.ngons} face(s) with more than 3 vertices"))
+
+    if stats.vertices > MAX_VERTICES:
+        problems.append(Problem(ERROR, CHECK_SIZE, name, f"{stats.vertices} vertices, the limit is {MAX_VERTICES}"))
+
+    if stats.triangles > MAX_TRIANGLES:
+        problems.append(Problem(ERROR, CHECK_SIZE, name, f"{stats.triangles} triangles, the limit is {MAX_TRIANGLES}"))
+
+    return problems
+
+
+def check_weights(name: str, stats: WeightStats) -> list[Problem]:
+    problems = []
+
+    if stats.over_limit:
+        problems.append(Problem(ERROR, CHECK_WEIGHTS, name, f"{stats.over_limit} vertices with more than {MAX_BONE_WEIGHTS} weights (up to {stats.max_weights})"))
+
+    if stats.bones > MAX_BONE_REFS:
+        problems.append(Problem(ERROR, CHECK_BONES, name, f"weighted to {stats.bones} bones, the limit is {MAX_BONE_REFS}"))
+
+    return problems
+
+
+def check_lods(surfaces: dict[int | None, set[str]]) -> list[Problem]:
+    """ Every LOD has to have the surfaces of LOD 0, the extra ones are only odd """
+    reference = surfaces.get(0)
+    if reference is None:
+        return []
+
+    problems = []
+    for lod in sorted(lod for lod in surfaces if lod not in (None, 0)):
+        names = surfaces[lod]
+        for surface in sorted(reference - names):
+            problems.append(Problem(ERROR, CHECK_LODS, f"model_root_{lod}", f"surface {surface} of LOD 0 is missing"))
+        for surface in sorted(names - reference):
+            problems.append(Problem(WARNING, CHECK_LODS, f"model_root_{lod}", f"surface {surface} is not in LOD 0"))
+
+    return problems
+
+
+def summary(problems: list[Problem]) -> Counter:
+    """ Problem count per check """
+    return Counter(problem.check for problem in problems)
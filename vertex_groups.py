@@ -0,0 +1,167 @@
+import bpy
+import numpy as np
+
+# A vertex group is considered empty below either of these
+MIN_VERTICES = 5
+MIN_WEIGHT_SUM = 0.100
+
+# Ghoul2 allows 4 bone weights per vertex, weights below MIN_WEIGHT are dropped
+MAX_INFLUENCES = 4
+MIN_WEIGHT = 0.010
+
+
+def weight_arrays(object: bpy.types.Object) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Every vertex group membership of a mesh object as three flat arrays: vertex index, group
+    index and weight. Deform weights have no foreach_get, so this is the one Python pass over
+    the vertices, everything done with the arrays afterwards is NumPy.
+    """
+    memberships = [(vertex.index, element.group, element.weight) for vertex in object.data.vertices for element in vertex.groups]
+
+    if not memberships:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+
+    flat = np.array(memberships, dtype=np.float64)
+    return flat[:, 0].astype(np.int64), flat[:, 1].astype(np.int64), flat[:, 2]
+
+
+def vertex_group_stats(object: bpy.types.Object) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vertex count and weight sum of every vertex group of a mesh object.
+
+    All memberships are flattened in a single pass over the vertices, then counted per group
+    with np.bincount, instead of walking every vertex once for every group.
+    """
+    total = len(object.vertex_groups)
+    _, groups, weights = weight_arrays(object)
+
+    # Stale memberships can point to groups that no longer exist
+    valid = groups < total
+    counts = np.bincount(groups[valid], minlength=total)
+    weight_sums = np.bincount(groups[valid], weights=weights[valid], minlength=total)
+    return counts, weight_sums
+
+
+def remove_empty_vertex_groups(object: bpy.types.Object, min_vertices: int = MIN_VERTICES, min_weight_sum: float = MIN_WEIGHT_SUM) -> int:
+    """ Remove the vertex groups with too few vertices or too little weight, returns how many were removed """
+    if not object.vertex_groups:
+        return 0
+
+    counts, weight_sums = vertex_group_stats(object)
+    empty = np.flatnonzero((counts < min_vertices) | (weight_sums < min_weight_sum))
+
+    # Look the groups up before removing anything, removing shifts the indices
+    vertex_groups = [object.vertex_groups[int(index)] for index in empty]
+    for vgroup in vertex_groups:
+        object.vertex_groups.remove(vgroup)
+
+    return len(vertex_groups)
+
+
+def remove_empty_vertex_groups_many(objects, min_vertices: int = MIN_VERTICES, min_weight_sum: float = MIN_WEIGHT_SUM) -> tuple[int, int]:
+    """ Run remove_empty_vertex_groups over many mesh objects, returns (groups removed, objects changed) """
+    removed = 0
+    changed = 0
+
+    for object in objects:
+        try:
+            if object.type != 'MESH':
+                continue
+            count = remove_empty_vertex_groups(object, min_vertices, min_weight_sum)
+        except ReferenceError:
+            continue
+
+        if count:
+            removed += count
+            changed += 1
+
+    return removed, changed
+
+
+def limited_weights(vertices: np.ndarray, weights: np.ndarray, max_influences: int = MAX_INFLUENCES, min_weight: float = MIN_WEIGHT) -> tuple[np.ndarray, np.ndarray]:
+    """
+    The weights flat membership arrays should get: every vertex keeps its max_influences
+    strongest weights, normalized, then weights below min_weight are dropped and the rest is
+    normalized again. A vertex always keeps its strongest weight. Returns (keep mask, new weights).
+    """
+    # Strongest weight first within every vertex
+    order = np.lexsort((-weights, vertices))
+    sorted_vertices = vertices[order]
+    starts = np.flatnonzero(np.r_[True, sorted_vertices[1:] != sorted_vertices[:-1]])
+    rank = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+
+    keep = np.empty(len(order), dtype=bool)
+    keep[order] = rank < max_influences
+    strongest = np.zeros(len(order), dtype=bool)
+    strongest[order[starts]] = True
+
+    new_weights = _normalized(vertices, np.where(keep, weights, 0.0))
+    keep &= (new_weights >= min_weight) | strongest
+    return keep, _normalized(vertices, np.where(keep, weights, 0.0))
+
+
+def _normalized(vertices: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    sums = np.bincount(vertices, weights=weights)[vertices]
+    return np.divide(weights, sums, out=weights.copy(), where=sums > 0)
+
+
+def limit_weights(object: bpy.types.Object, max_influences: int = MAX_INFLUENCES, min_weight: float = MIN_WEIGHT, bones: set[str] | None = None) -> int:
+    """
+    Limit, prune and normalize the weights of a mesh object, see limited_weights(). Only groups
+    named after a bone take part when bones is given. Returns how many vertices changed.
+
+    Only the memberships that change are written back: removals with one remove() call per
+    group, new weights with one add() call per group and distinct weight.
+    """
+    vertex_groups = object.vertex_groups
+    vertices, groups, weights = weight_arrays(object)
+
+    # Stale memberships and non-bone groups are left alone
+    deform = np.array([bones is None or group.name in bones for group in vertex_groups] + [False], dtype=bool)
+    valid = deform[np.minimum(groups, len(vertex_groups))]
+    vertices, groups, weights = vertices[valid], groups[valid], weights[valid]
+    if not len(vertices):
+        return 0
+
+    keep, new_weights = limited_weights(vertices, weights, max_influences, min_weight)
+    removed = ~keep
+    updated = keep & ~np.isclose(new_weights, weights, rtol=0.0, atol=1e-6)
+
+    for group in np.unique(groups[removed]).tolist():
+        vertex_groups[group].remove(vertices[removed & (groups == group)].tolist())
+
+    for group in np.unique(groups[updated]).tolist():
+        mask = updated & (groups == group)
+        values, inverse = np.unique(new_weights[mask], return_inverse=True)
+        order = np.argsort(inverse.reshape(-1), kind="stable")
+        runs = np.split(vertices[mask][order], np.cumsum(np.bincount(inverse.reshape(-1)))[:-1])
+        for value, run in zip(values.tolist(), runs):
+            vertex_groups[group].add(run.tolist(), value, 'REPLACE')
+
+    return len(np.unique(vertices[removed | updated]))
+
+
+def limit_weights_many(objects, max_influences: int = MAX_INFLUENCES, min_weight: float = MIN_WEIGHT, bones: set[str] | None = None) -> tuple[int, int]:
+    """ Run limit_weights over many mesh objects, returns (vertices changed, objects changed) """
+    changed_vertices = 0
+    changed = 0
+    seen = set()
+
+    for object in objects:
+        try:
+            if object.type != 'MESH' or not object.vertex_groups:
+                continue
+            # Deform weights live in the mesh, a shared mesh is only done once
+            key = object.data.as_pointer()
+            if key in seen or object.data.library:
+                continue
+            seen.add(key)
+            count = limit_weights(object, max_influences, min_weight, bones)
+        except ReferenceError:
+            continue
+
+        if count:
+            changed_vertices += count
+            changed += 1
+
+    return changed_vertices, changed